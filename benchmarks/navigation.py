@@ -0,0 +1,110 @@
+from argparse import ArgumentParser
+from pathlib import Path
+import json
+import time
+
+from driver_manager import driver_manager
+from parser import AsyncParser
+from settings import BenchmarkSettings
+
+
+def get_transferred_bytes(logs: list[dict[str, str]]) -> int:
+    """Отдаёт объём загруженных данных по журналу производительности.
+
+    Args:
+        logs (list[dict[str, str]]): журнал производительности драйвера.
+
+    Returns:
+        int: объём в байтах.
+    """
+    transferred = 0
+    for log in logs:
+        message = json.loads(log['message'])['message']
+        if message['method'] == 'Network.loadingFinished':
+            transferred += message['params'].get('encodedDataLength', 0)
+    return transferred
+
+
+def measure_profile(name_profile: str, url: str) -> tuple[float, int]:
+    """Измеряет время до получения meta данных и объём загрузки.
+
+    Args:
+        name_profile (str): название профиля навигации.
+        url (str): url страницы подрубрики.
+
+    Returns:
+        tuple[float, int]: лучшее время в мс и объём в байтах.
+    """
+    parser = AsyncParser()
+    parser._driver = driver_manager._create_driver(name_profile)
+    try:
+        times = []
+        transferred = 0
+        for _ in range(BenchmarkSettings.COUNT_REPEAT_NAVIGATION):
+            parser.driver.get_log('performance')
+            start = time.perf_counter()
+            parser._navigate(url)
+            parser._get_meta_data()
+            times.append((time.perf_counter() - start) * 1000)
+            transferred = get_transferred_bytes(
+                parser.driver.get_log('performance')
+            )
+    finally:
+        driver_manager._quit(parser._driver)
+        parser._driver = None
+    return min(times), transferred
+
+
+def get_report(url: str, names_profile: tuple[str, ...]) -> str:
+    """Отдаёт отчёт по стоимости загрузки страницы.
+
+    Args:
+        url (str): url страницы подрубрики.
+        names_profile (tuple[str, ...]): названия профилей навигации.
+
+    Returns:
+        str: отчёт.
+    """
+    lines = [url]
+    for name_profile in names_profile:
+        run_time, transferred = measure_profile(name_profile, url)
+        lines.append(
+            f'{name_profile}: {run_time:.1f} мс, '
+            f'{transferred / 1024:.1f} КБ'
+        )
+    return '\n'.join(lines)
+
+
+def navigation() -> None:
+    """Бенчмарк профилей навигации."""
+    parser = ArgumentParser(description='Бенчмарк профилей навигации')
+    parser.add_argument(
+        'url',
+        help='url страницы подрубрики',
+        nargs='?',
+        default=BenchmarkSettings.URL_NAVIGATION,
+    )
+    parser.add_argument(
+        '-n',
+        '--navigation-profile',
+        help='Профили навигации',
+        choices=tuple(driver_manager.NAVIGATION_PROFILES),
+        nargs='+',
+        default=tuple(driver_manager.NAVIGATION_PROFILES),
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        help='Файл для сохранения отчёта',
+        type=Path,
+        default=None,
+    )
+    args = parser.parse_args()
+    report = get_report(args.url, tuple(args.navigation_profile))
+    print(report)
+    if args.output:
+        args.output.write_text(f'{report}\n')
+
+
+if __name__ == '__main__':
+    navigation()
@@ -0,0 +1,109 @@
+from argparse import ArgumentParser
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+from settings import BenchmarkSettings
+
+
+def get_import_times(module: str) -> list[tuple[str, int, int]]:
+    """Отдаёт время импорта модулей по данным `-X importtime`.
+
+    Args:
+        module (str): импортируемый модуль.
+
+    Returns:
+        list[tuple[str, int, int]]:
+            модуль, глубина вложенности и накопленное время импорта в мкс.
+    """
+    process = subprocess.run(
+        (sys.executable, '-X', 'importtime', '-c', f'import {module}'),
+        capture_output=True,
+        text=True,
+        cwd=BenchmarkSettings.BASE_PATH,
+    )
+    import_times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        _, cumulative_time, name = line[12:].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        import_times.append((name.strip(), depth, int(cumulative_time)))
+    return import_times
+
+
+def get_run_time(args: tuple[str, ...]) -> float:
+    """Отдаёт время запуска процесса.
+
+    Args:
+        args (tuple[str, ...]): аргументы запуска `main.py`.
+
+    Returns:
+        float: время в мс.
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        (sys.executable, 'main.py', *args),
+        capture_output=True,
+        cwd=BenchmarkSettings.BASE_PATH,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def get_report(count_top: int) -> str:
+    """Отдаёт отчёт по времени старта.
+
+    Args:
+        count_top (int): кол-во самых тяжёлых импортов в отчёте.
+
+    Returns:
+        str: отчёт.
+    """
+    lines = []
+    for module in BenchmarkSettings.STARTUP_MODULES:
+        import_times = get_import_times(module)
+        total = sum(data[2] for data in import_times if not data[1])
+        lines.append(f'import {module}: {total / 1000:.1f} мс')
+        heavy = sorted(
+            (data for data in import_times if data[1] <= 1),
+            key=lambda data: data[2],
+            reverse=True,
+        )
+        for name, _, cumulative_time in heavy[:count_top]:
+            lines.append(f'  {name}: {cumulative_time / 1000:.1f} мс')
+    for args in BenchmarkSettings.STARTUP_COMMANDS:
+        run_time = min(
+            get_run_time(args)
+            for _ in range(BenchmarkSettings.COUNT_REPEAT_STARTUP)
+        )
+        lines.append(f'main.py {' '.join(args)}: {run_time:.1f} мс')
+    return '\n'.join(lines)
+
+
+def startup() -> None:
+    """Бенчмарк времени старта CLI."""
+    parser = ArgumentParser(description='Бенчмарк времени старта')
+    parser.add_argument(
+        '-t',
+        '--top',
+        help='Кол-во самых тяжёлых импортов',
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        help='Файл для сохранения отчёта',
+        type=Path,
+        default=None,
+    )
+    args = parser.parse_args()
+    report = get_report(args.top)
+    print(report)
+    if args.output:
+        args.output.write_text(f'{report}\n')
+
+
+if __name__ == '__main__':
+    startup()
@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Awaitable, Callable
+import asyncio
+import json
+import time
+
+from settings import ParserSettings
+from writer import write_atomic
+
+
+class BranchCache(ParserSettings):
+    """Кэш филиалов по городу и id организации.
+
+    Хранит филиалы в памяти (LRU) и, опционально, на диске,
+    оба уровня с TTL_BRANCHES. Филиалы запрашиваются по области
+    поиска города, поэтому ключ кэша включает город.
+    Одновременные запросы филиалов одной организации объединяются.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация кэша."""
+        self.lock = Lock()
+        self.branches: OrderedDict[
+            tuple[str, str], tuple[float, list[dict[str, Any]]]
+        ] = OrderedDict()
+        self.in_flight: dict[tuple[str, str], asyncio.Task] = {}
+
+    def _get_path(self, slug_city: str, org_id: str) -> Path:
+        """Отдаёт путь к файлу филиалов организации.
+
+        Args:
+            slug_city (str): slug города.
+            org_id (str): id организации.
+
+        Returns:
+            Path: путь к файлу.
+        """
+        return Path(self.BRANCHES_CACHE_DIR, slug_city, f'{org_id}.json')
+
+    def _load(
+        self,
+        slug_city: str,
+        org_id: str,
+    ) -> tuple[float, list[dict[str, Any]]] | None:
+        """Отдаёт филиалы из дискового кэша.
+
+        Args:
+            slug_city (str): slug города.
+            org_id (str): id организации.
+
+        Returns:
+            tuple[float, list[dict[str, Any]]] | None: время сохранения
+                и филиалы, если кэш актуален.
+        """
+        path = self._get_path(slug_city, org_id)
+        try:
+            time_saved = path.stat().st_mtime
+            if time.time() - time_saved > self.TTL_BRANCHES:
+                return None
+            with open(path, 'r') as file:
+                return time_saved, json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+
+    def _save(
+        self,
+        slug_city: str,
+        org_id: str,
+        branches: list[dict[str, Any]],
+    ) -> None:
+        """Сохраняет филиалы в дисковый кэш.
+
+        Args:
+            slug_city (str): slug города.
+            org_id (str): id организации.
+            branches (list[dict[str, Any]]): филиалы.
+        """
+        write_atomic(
+            self._get_path(slug_city, org_id), json.dumps(branches).encode()
+        )
+
+    def get(
+        self,
+        slug_city: str,
+        org_id: str,
+    ) -> list[dict[str, Any]] | None:
+        """Отдаёт филиалы из кэша.
+
+        Args:
+            slug_city (str): slug города.
+            org_id (str): id организации.
+
+        Returns:
+            list[dict[str, Any]] | None: филиалы, если они есть в кэше
+                и не старше TTL_BRANCHES.
+        """
+        key = (slug_city, org_id)
+        with self.lock:
+            if key in self.branches:
+                time_saved, branches = self.branches[key]
+                if time.time() - time_saved <= self.TTL_BRANCHES:
+                    self.branches.move_to_end(key)
+                    return branches
+                del self.branches[key]
+        if not self.CACHE_BRANCHES_ON_DISK:
+            return None
+        saved = self._load(slug_city, org_id)
+        if saved is None:
+            return None
+        self._set_in_memory(key, *saved)
+        return saved[1]
+
+    def _set_in_memory(
+        self,
+        key: tuple[str, str],
+        time_saved: float,
+        branches: list[dict[str, Any]],
+    ) -> None:
+        """Сохраняет филиалы в памяти с вытеснением старых.
+
+        Args:
+            key (tuple[str, str]): slug города и id организации.
+            time_saved (float): время получения филиалов.
+            branches (list[dict[str, Any]]): филиалы.
+        """
+        with self.lock:
+            self.branches[key] = (time_saved, branches)
+            self.branches.move_to_end(key)
+            while len(self.branches) > self.MAX_SIZE_BRANCHES_CACHE:
+                self.branches.popitem(last=False)
+
+    def set(
+        self,
+        slug_city: str,
+        org_id: str,
+        branches: list[dict[str, Any]],
+    ) -> None:
+        """Сохраняет филиалы в кэш.
+
+        Args:
+            slug_city (str): slug города.
+            org_id (str): id организации.
+            branches (list[dict[str, Any]]): филиалы.
+        """
+        self._set_in_memory((slug_city, org_id), time.time(), branches)
+        if self.CACHE_BRANCHES_ON_DISK:
+            self._save(slug_city, org_id, branches)
+
+    def _fetched(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        """Обработка завершения запроса филиалов.
+
+        Args:
+            key (tuple[str, str]): slug города и id организации.
+            task (asyncio.Task): задача запроса.
+        """
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.set(*key, task.result())
+
+    async def get_or_fetch(
+        self,
+        slug_city: str,
+        org_id: str,
+        fetch: Callable[[], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """Отдаёт филиалы из кэша, либо запрашивает их.
+
+        Args:
+            slug_city (str): slug города.
+            org_id (str): id организации.
+            fetch (Callable[[], Awaitable[list[dict[str, Any]]]]):
+                запрос филиалов.
+
+        Returns:
+            list[dict[str, Any]]: филиалы.
+        """
+        branches = self.get(slug_city, org_id)
+        if branches is not None:
+            return branches
+        key = (slug_city, org_id)
+        loop = asyncio.get_running_loop()
+        task = self.in_flight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(fetch())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda task: self._fetched(key, task))
+        return await asyncio.shield(task)
+
+
+branch_cache = BranchCache()
@@ -1,7 +1,13 @@
 from argparse import ArgumentParser, ArgumentTypeError
+from pathlib import Path
 import re
 
-from settings import GUISettings
+from settings import (
+    GUISettings,
+    ParserSettings,
+    QuerySettings,
+    WriterSettings,
+)
 
 
 def validate_slug_city(value: str) -> str:
@@ -73,4 +79,112 @@ def parser_command_line() -> ArgumentParser:
         default='moscow',
         required=False,
     )
+    parser.add_argument(
+        '-p',
+        '--profile',
+        action='store_true',
+        help='Профилирование парсинга по подрубрикам',
+    )
+    parser.add_argument(
+        '--two-phase',
+        action='store_true',
+        help='Запрос полных данных только для новых фирм',
+    )
+    parser.add_argument(
+        '--meta-cache',
+        action='store_true',
+        help='Кэш ключа API и области поиска города между подрубриками',
+    )
+    parser.add_argument(
+        '--tiles',
+        action='store_true',
+        help='Деление области поиска на тайлы для крупных подрубрик',
+    )
+    parser.add_argument(
+        '--navigation-profile',
+        help='Профиль навигации браузера',
+        choices=tuple(ParserSettings.NAVIGATION_PROFILES),
+        default=ParserSettings.NAVIGATION_PROFILE,
+    )
+    parser.add_argument(
+        '--persistent-profile',
+        action='store_true',
+        help='Постоянный профиль Chrome с дисковым кэшем',
+    )
+    parser.add_argument(
+        '--decode',
+        help='Декодирование и нормализация фирм: в цикле событий, '
+        'в пуле потоков или процессов',
+        choices=ParserSettings.MODES_DECODE_FIRMS,
+        default=ParserSettings.DECODE_FIRMS,
+    )
+    parser.add_argument(
+        '--dedup',
+        help='Обработка близких дубликатов фирм',
+        choices=ParserSettings.MODES_DEDUP_FIRMS,
+        default=ParserSettings.DEDUP_FIRMS,
+    )
+    parser.add_argument(
+        '--probe',
+        action='store_true',
+        help=(
+            'Пропуск неизменных подрубрик по пробе первой страницы, '
+            'только с --daemon'
+        ),
+    )
+    parser.add_argument(
+        '--proxies',
+        help='Файл со списком прокси, по одному URL на строку',
+        type=Path,
+        default=ParserSettings.PROXIES_PATH,
+    )
+    parser.add_argument(
+        '--record',
+        help='Запись переходов браузера и ответов API в архив',
+        type=Path,
+        default=None,
+    )
+    parser.add_argument(
+        '--replay',
+        help='Воспроизведение парсинга из архива без сети и Chrome',
+        type=Path,
+        default=None,
+    )
+    parser.add_argument(
+        '--replay-timing',
+        action='store_true',
+        help='Воспроизведение с записанными задержками',
+    )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='Сжатие сохраняемых результатов gzip',
+    )
+    parser.add_argument(
+        '--fsync',
+        help='Политика fsync при сохранении результатов',
+        choices=WriterSettings.POLICIES_FSYNC,
+        default=WriterSettings.FSYNC_POLICY,
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Повторный парсинг подрубрик города по приоритету изменений',
+    )
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Индексация спаршенных фирм города для сервиса запросов',
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Запуск HTTP-сервиса запросов к фирмам',
+    )
+    parser.add_argument(
+        '--port',
+        help='Порт HTTP-сервиса запросов',
+        type=int,
+        default=QuerySettings.PORT,
+    )
     return parser
@@ -0,0 +1,180 @@
+from collections import defaultdict
+from typing import Any
+import math
+import re
+
+from settings import ParserSettings
+from typings import Cell, KeyFirm
+
+
+class FirmsIndex(ParserSettings):
+    """Пространственный индекс фирм для поиска близких дубликатов.
+
+    Фирмы раскладываются по ячейкам сетки SIZE_CELL_DEDUP градусов
+    с нормализованными названием, телефоном и адресом. Фирма считается
+    дубликатом, если в её ячейке или соседних есть фирма с не менее
+    чем MIN_MATCHES_DEDUP совпавшими ключами.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация индекса."""
+        self.firms: list[dict[str, Any]] = []
+        self.index: defaultdict[tuple[str, str, Cell], list[int]] = (
+            defaultdict(list)
+        )
+
+    def _normalize(self, value: str) -> str:
+        """Нормализует строку для сравнения.
+
+        Args:
+            value (str): строка.
+
+        Returns:
+            str: строка без регистра, пунктуации и служебных слов.
+        """
+        words = re.findall(r'\w+', value.lower().replace('ё', 'е'))
+        return ' '.join(
+            word for word in words if word not in self.STOP_WORDS_DEDUP
+        )
+
+    def _get_keys(self, firm: dict[str, Any]) -> list[KeyFirm]:
+        """Отдаёт ключи сравнения фирмы.
+
+        Args:
+            firm (dict[str, Any]): данные по фирме.
+
+        Returns:
+            list[KeyFirm]: вид и значение ключей.
+        """
+        keys = []
+        if name := self._normalize(firm.get('name') or ''):
+            keys.append(('name', name))
+        if address := self._normalize(firm.get('address') or ''):
+            keys.append(('address', address))
+        if phone := re.sub(r'\D', '', firm.get('phone') or '')[-10:]:
+            keys.append(('phone', phone))
+        return keys
+
+    def _get_cell(self, point: dict[str, float] | None) -> Cell:
+        """Отдаёт ячейку сетки точки.
+
+        Args:
+            point (dict[str, float] | None): координаты фирмы.
+
+        Returns:
+            Cell: ячейка, None - координат нет.
+        """
+        if not point:
+            return None
+        return (
+            math.floor(point['lat'] / self.SIZE_CELL_DEDUP),
+            math.floor(point['lon'] / self.SIZE_CELL_DEDUP),
+        )
+
+    def _get_neighbours(self, cell: Cell) -> list[Cell]:
+        """Отдаёт ячейку и её соседей.
+
+        Args:
+            cell (Cell): ячейка.
+
+        Returns:
+            list[Cell]: ячейки для поиска.
+        """
+        if cell is None:
+            return [None]
+        return [
+            (cell[0] + lat, cell[1] + lon)
+            for lat in (-1, 0, 1)
+            for lon in (-1, 0, 1)
+        ]
+
+    def find(
+        self,
+        keys: list[KeyFirm],
+        cell: Cell,
+    ) -> dict[str, Any] | None:
+        """Ищет близкий дубликат фирмы.
+
+        Args:
+            keys (list[KeyFirm]): ключи сравнения фирмы.
+            cell (Cell): ячейка фирмы.
+
+        Returns:
+            dict[str, Any] | None: найденная фирма.
+        """
+        matches: defaultdict[int, set[str]] = defaultdict(set)
+        for neighbour in self._get_neighbours(cell):
+            for kind, value in keys:
+                for number in self.index.get((kind, value, neighbour), []):
+                    matches[number].add(kind)
+        for number in sorted(matches):
+            if len(matches[number]) >= self.MIN_MATCHES_DEDUP:
+                return self.firms[number]
+        return None
+
+    def add(
+        self,
+        firm: dict[str, Any],
+        keys: list[KeyFirm],
+        cell: Cell,
+    ) -> None:
+        """Добавляет фирму в индекс.
+
+        Args:
+            firm (dict[str, Any]): данные по фирме.
+            keys (list[KeyFirm]): ключи сравнения фирмы.
+            cell (Cell): ячейка фирмы.
+        """
+        for kind, value in keys:
+            self.index[(kind, value, cell)].append(len(self.firms))
+        self.firms.append(firm)
+
+    def _merge(
+        self,
+        firm: dict[str, Any],
+        duplicate: dict[str, Any],
+    ) -> None:
+        """Дополняет пустые поля фирмы данными дубликата.
+
+        Args:
+            firm (dict[str, Any]): данные по фирме.
+            duplicate (dict[str, Any]): данные по дубликату.
+        """
+        for key in self.KEYS_MERGE_DEDUP:
+            if not firm.get(key) and duplicate.get(key):
+                firm[key] = duplicate[key]
+
+    def dedup(
+        self,
+        firms: list[dict[str, Any]],
+        mode: str,
+    ) -> list[dict[str, Any]]:
+        """Обрабатывает близкие дубликаты фирм.
+
+        'keep' - оставляет дубликаты, 'merge' - исключает их, дополняя
+        найденную фирму, 'flag' - помечает id организации оригинала.
+        Координаты используются только здесь и из данных удаляются.
+
+        Args:
+            firms (list[dict[str, Any]]): фирмы.
+            mode (str): режим из MODES_DEDUP_FIRMS.
+
+        Returns:
+            list[dict[str, Any]]: обработанные фирмы.
+        """
+        if mode == 'keep':
+            return firms
+        no_duplicates_firms = []
+        for firm in firms:
+            cell = self._get_cell(firm.pop('point', None))
+            keys = self._get_keys(firm)
+            original = self.find(keys, cell)
+            if original is None:
+                self.add(firm, keys, cell)
+            elif mode == 'merge':
+                self._merge(original, firm)
+                continue
+            else:
+                firm['duplicate_of'] = original['org_id']
+            no_duplicates_firms.append(firm)
+        return no_duplicates_firms
@@ -0,0 +1,417 @@
+from pathlib import Path
+from queue import Queue, Empty
+from threading import Lock, Thread
+from typing import Any, TYPE_CHECKING
+from urllib.parse import urljoin
+import json
+import logging
+import shutil
+import tempfile
+import time
+
+from proxy_pool import proxy_pool
+from settings import ParserSettings
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+
+logger = logging.getLogger(__name__)
+
+
+class DriverManager(ParserSettings):
+    """Менеджер драйверов Chrome процесса.
+
+    Selenium и webdriver_manager импортируются только при запуске
+    драйвера, чтобы не замедлять старт приложения.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация менеджера."""
+        self.lock = Lock()
+        self.profile_lock = Lock()
+        self.profiles: dict[int, Path] = {}
+        self.proxies: dict[int, Any] = {}
+        self.drivers: 'Queue[Chrome]' = Queue()
+        self.navigations: dict[int, int] = {}
+        self.count_warming = 0
+        self.threads: list[Thread] = []
+        self.is_closed = False
+        self.driver_path: str | None = None
+
+    def _load_driver_path(self) -> dict[str, str | float]:
+        """Отдаёт закэшированные данные по драйверу.
+
+        Returns:
+            dict[str, str | float]: путь к драйверу и время его получения.
+        """
+        path = Path(self.DRIVER_CACHE_PATH)
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or not Path(data.get('path', '')).exists()
+        ):
+            return {}
+        return data
+
+    def _get_driver_path(self) -> str:
+        """Отдаёт путь к chromedriver.
+
+        Путь кэшируется на диске, webdriver_manager вызывается только
+        после истечения срока кэша. Без сети используется устаревший кэш.
+
+        Returns:
+            str: путь к chromedriver.
+        """
+        with self.lock:
+            if self.driver_path:
+                return self.driver_path
+            data = self._load_driver_path()
+            if data and time.time() - data['time'] < self.TTL_DRIVER_PATH:
+                self.driver_path = data['path']
+                return self.driver_path
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            try:
+                self.driver_path = ChromeDriverManager().install()
+            except Exception:
+                if not data:
+                    raise
+                self.driver_path = data['path']
+                return self.driver_path
+            path = Path(self.DRIVER_CACHE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as file:
+                json.dump(
+                    {'path': self.driver_path, 'time': time.time()}, file
+                )
+            return self.driver_path
+
+    def _get_blocked_urls(self, profile: dict[str, Any]) -> list[str]:
+        """Отдаёт блокируемые URL с учётом профиля навигации.
+
+        Args:
+            profile (dict[str, Any]): профиль навигации.
+
+        Returns:
+            list[str]: шаблоны блокируемых URL.
+        """
+        blocked_urls = list(self.BLOCKED_URLS)
+        for resource in profile['blocked_resources']:
+            blocked_urls.extend(self.BLOCKED_RESOURCES[resource])
+        return blocked_urls
+
+    def _clone_profile(self) -> Path:
+        """Копирует шаблонный профиль Chrome для нового драйвера.
+
+        Chrome блокирует каталог профиля, поэтому каждый драйвер пула
+        работает со своей копией шаблона без файлов блокировки.
+
+        Returns:
+            Path: каталог профиля драйвера.
+        """
+        path_drivers = Path(self.USER_DATA_DIR, 'drivers')
+        path_drivers.mkdir(parents=True, exist_ok=True)
+        path = Path(tempfile.mkdtemp(dir=path_drivers))
+        path_template = Path(self.USER_DATA_DIR, 'template')
+        with self.profile_lock:
+            if path_template.exists():
+                shutil.copytree(
+                    path_template,
+                    path,
+                    ignore=shutil.ignore_patterns(*self.IGNORE_PROFILE_FILES),
+                    dirs_exist_ok=True,
+                )
+        return path
+
+    def _create_driver(
+        self,
+        name_profile: str | None = None,
+        user_data_dir: Path | None = None,
+    ) -> 'Chrome':
+        """Создаёт драйвер с настроенной блокировкой запросов.
+
+        Args:
+            name_profile (str | None, optional): название профиля
+                навигации. Defaults to None - NAVIGATION_PROFILE.
+            user_data_dir (Path | None, optional): каталог профиля
+                Chrome. Defaults to None - копия шаблонного профиля.
+
+        Returns:
+            Chrome: драйвер.
+        """
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver import Chrome, ChromeOptions
+
+        profile = self.NAVIGATION_PROFILES[
+            name_profile or self.NAVIGATION_PROFILE
+        ]
+        options = ChromeOptions()
+        for arg_option in self.ARGS_OPTION:
+            if (
+                self.PERSISTENT_PROFILE
+                and arg_option in self.ARGS_DISABLE_CACHE
+            ):
+                continue
+            options.add_argument(arg_option)
+        if self.PERSISTENT_PROFILE:
+            user_data_dir = user_data_dir or self._clone_profile()
+            options.add_argument(f'--user-data-dir={user_data_dir.resolve()}')
+            options.add_argument(f'--disk-cache-size={self.DISK_CACHE_SIZE}')
+        if profile['headless']:
+            options.add_argument('--headless=new')
+        if profile['window_size']:
+            width, height = profile['window_size']
+            options.add_argument(f'--window-size={width},{height}')
+        else:
+            options.add_argument('--start-maximized')
+        options.page_load_strategy = profile['page_load_strategy']
+        proxy = proxy_pool.acquire_driver()
+        if proxy is not None:
+            options.add_argument(f'--proxy-server={proxy.url_driver}')
+        options.add_experimental_option('detach', True)
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        service = Service(executable_path=self._get_driver_path())
+        try:
+            driver = Chrome(options=options, service=service)
+        except Exception:
+            proxy_pool.release_driver(proxy)
+            raise
+        self.proxies[id(driver)] = proxy
+        driver.set_script_timeout(self.TIMEOUT_READY_PAGE * 2)
+        if self.PERSISTENT_PROFILE:
+            self.profiles[id(driver)] = user_data_dir
+        driver.execute_cdp_cmd(
+            'Network.setBlockedURLs',
+            {'urls': self._get_blocked_urls(profile)},
+        )
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Performance.enable', {})
+        return driver
+
+    def _add_driver(self) -> None:
+        """Запускает драйвер и кладёт его в пул.
+
+        Драйвер, запущенный после закрытия менеджера, сразу закрывается.
+        """
+        try:
+            driver = self._create_driver()
+        except Exception:
+            logger.warning('Ошибка прогрева драйвера', exc_info=True)
+            with self.lock:
+                self.count_warming -= 1
+            return
+        self.navigations[id(driver)] = 0
+        with self.lock:
+            self.count_warming -= 1
+            if not self.is_closed:
+                self.drivers.put(driver)
+                return
+        self._quit(driver)
+
+    def warm_up(self) -> None:
+        """Прогревает драйверы в фоне до нужного количества.
+
+        Прогрев выполняется только для пула из нескольких драйверов,
+        разовый запуск работает с одним драйвером без фоновых Chrome.
+        """
+        if self.COUNT_WARM_DRIVERS <= 1:
+            return
+        with self.lock:
+            if self.is_closed:
+                return
+            count = (
+                self.COUNT_WARM_DRIVERS
+                - self.drivers.qsize()
+                - self.count_warming
+            )
+            self.count_warming += max(count, 0)
+            self.threads = [
+                thread for thread in self.threads if thread.is_alive()
+            ]
+            for _ in range(count):
+                thread = Thread(target=self._add_driver, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def acquire(self) -> 'Chrome':
+        """Выдаёт прогретый драйвер, либо запускает новый.
+
+        Returns:
+            Chrome: драйвер.
+        """
+        try:
+            driver = self.drivers.get_nowait()
+        except Empty:
+            driver = self._create_driver()
+            self.navigations[id(driver)] = 0
+        self.warm_up()
+        return driver
+
+    def _get_memory(self, driver: 'Chrome') -> int:
+        """Отдаёт объём JS-кучи браузера.
+
+        Args:
+            driver (Chrome): драйвер.
+
+        Returns:
+            int: объём памяти в байтах.
+        """
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})
+        for metric in metrics['metrics']:
+            if metric['name'] == 'JSHeapTotalSize':
+                return int(metric['value'])
+        return 0
+
+    def _quit(self, driver: 'Chrome') -> None:
+        """Закрывает драйвер.
+
+        Args:
+            driver (Chrome): драйвер.
+        """
+        from selenium.common.exceptions import WebDriverException
+
+        self.navigations.pop(id(driver), None)
+        user_data_dir = self.profiles.pop(id(driver), None)
+        proxy_pool.release_driver(self.proxies.pop(id(driver), None))
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        if user_data_dir and user_data_dir.parent.name == 'drivers':
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    def _load_warmed_cities(self) -> dict[str, float]:
+        """Отдаёт города, под которые прогрет шаблонный профиль.
+
+        Returns:
+            dict[str, float]: slug города и время прогрева.
+        """
+        try:
+            with open(Path(self.USER_DATA_DIR, 'warmed.json'), 'r') as file:
+                data = json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def warm_cache(self, slug_city: str) -> None:
+        """Прогревает кэш шаблонного профиля под город.
+
+        Шаблон прогревается один раз за TTL_PROFILE_CACHE, после чего
+        простаивающие драйверы пула пересоздаются из свежего шаблона.
+
+        Args:
+            slug_city (str): slug города.
+        """
+        if not self.PERSISTENT_PROFILE:
+            return
+        from selenium.common.exceptions import WebDriverException
+
+        with self.profile_lock:
+            warmed_cities = self._load_warmed_cities()
+            if (
+                time.time() - warmed_cities.get(slug_city, 0)
+                < self.TTL_PROFILE_CACHE
+            ):
+                return
+            path_template = Path(self.USER_DATA_DIR, 'template')
+            path_template.mkdir(parents=True, exist_ok=True)
+            driver = self._create_driver(user_data_dir=path_template)
+            try:
+                driver.get(
+                    urljoin(
+                        f'{urljoin(self.WEBSITE, slug_city)}/',
+                        self.SLUG_RUBRICS,
+                    )
+                )
+            except WebDriverException:
+                return
+            finally:
+                self._quit(driver)
+            warmed_cities[slug_city] = time.time()
+            with open(Path(self.USER_DATA_DIR, 'warmed.json'), 'w') as file:
+                json.dump(warmed_cities, file)
+        self._quit_idle()
+        self.warm_up()
+
+    def is_exhausted(
+        self,
+        driver: 'Chrome',
+        count_navigations: int = 0,
+    ) -> bool:
+        """Проверяет, исчерпал ли драйвер свои лимиты.
+
+        Лимиты - MAX_NAVIGATIONS_DRIVER переходов и MAX_MEMORY_DRIVER
+        памяти. Недоступный драйвер считается исчерпанным.
+
+        Args:
+            driver (Chrome): драйвер.
+            count_navigations (int): кол-во переходов с выдачи драйвера.
+
+        Returns:
+            bool: True - драйвер нужно пересоздать.
+        """
+        from selenium.common.exceptions import WebDriverException
+
+        navigations = self.navigations.get(id(driver), 0) + count_navigations
+        try:
+            return (
+                navigations >= self.MAX_NAVIGATIONS_DRIVER
+                or self._get_memory(driver) > self.MAX_MEMORY_DRIVER
+            )
+        except WebDriverException:
+            return True
+
+    def release(
+        self,
+        driver: 'Chrome',
+        count_navigations: int = 0,
+    ) -> None:
+        """Возвращает драйвер в пул, либо пересоздаёт его.
+
+        Драйвер пересоздаётся после MAX_NAVIGATIONS_DRIVER переходов
+        или при превышении MAX_MEMORY_DRIVER.
+
+        Args:
+            driver (Chrome): драйвер.
+            count_navigations (int): кол-во переходов с выдачи драйвера.
+        """
+        is_recycle = (
+            self.is_exhausted(driver, count_navigations)
+            or self.drivers.qsize() >= self.COUNT_WARM_DRIVERS
+        )
+        self.navigations[id(driver)] = (
+            self.navigations.get(id(driver), 0) + count_navigations
+        )
+        if is_recycle or self.is_closed:
+            self._quit(driver)
+            self.warm_up()
+            return
+        self.drivers.put(driver)
+
+    def _quit_idle(self) -> None:
+        """Закрывает простаивающие драйверы пула."""
+        while True:
+            try:
+                self._quit(self.drivers.get_nowait())
+            except Empty:
+                return
+
+    def shutdown(self) -> None:
+        """Закрывает менеджер и все драйверы пула.
+
+        Дожидается прогревающих потоков, их драйверы закрываются.
+        """
+        with self.lock:
+            self.is_closed = True
+            threads = self.threads
+            self.threads = []
+        for thread in threads:
+            thread.join()
+        self._quit_idle()
+
+
+driver_manager = DriverManager()
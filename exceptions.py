@@ -1,2 +1,10 @@
 class NoCityOn2GISException(Exception):
     """Исключение отсутсвия города на 2GIS."""
+
+
+class NoRecordReplayException(Exception):
+    """Исключение отсутствия записи в архиве воспроизведения."""
+
+
+class ProxiesRejectedException(Exception):
+    """Исключение отклонения запроса к API всеми попытками через прокси."""
@@ -1,7 +1,6 @@
 import sys
 from pathlib import Path
 from os.path import join
-from datetime import datetime
 import json
 import re
 from typing import Any
@@ -9,11 +8,16 @@ from time import sleep
 from threading import Thread
 
 from PyQt6 import QtWidgets, uic
-from PyQt6.QtWidgets import QMainWindow, QListWidgetItem, QFileDialog
+from PyQt6.QtWidgets import QMainWindow, QFileDialog
 from PyQt6.QtCore import QRegularExpression
-from PyQt6.QtGui import QRegularExpressionValidator, QColor
+from PyQt6.QtGui import QRegularExpressionValidator
 
 from settings import GUISettings
+from driver_manager import driver_manager
+from proxy_pool import proxy_pool
+from jobs import JobScheduler
+from logs import ConsoleLogSink
+from rubrics_model import RubricsModel, RubricItem
 from threads import (
     ParsingRubricsThread,
     ParsingFirmRubricTread,
@@ -21,6 +25,7 @@ from threads import (
     SendFirmsToServerThread,
 )
 from typings import RubricsData
+from writer import read_json, result_writer
 
 
 class GUI(GUISettings):
@@ -34,22 +39,14 @@ class GUI(GUISettings):
     ) -> None:
         """Устанавливает строку в консоль.
 
+        Безопасен для вызова из потоков парсинга.
+
         Args:
             text (str): текст строчки.
             color (str | None, optional): цвет текста. Defaults to None.
             support_info (str): вспомогательная информация.
         """
-
-        item = QListWidgetItem(
-            f'{datetime.now().strftime(self.FORMAT_TIME)} | {support_info} > '
-            f'{text}'
-        )
-        if color:
-            item.setForeground(QColor(color))
-        console = self.win.console
-        console.addItem(item)
-        if console.count() > self.MAX_ROW_CONSOLE:
-            console.takeItem(0)
+        self.log_sink.write(text, color, support_info)
 
     def _display_rubrics(self, data: RubricsData) -> None:
         """Выводит рубрики.
@@ -58,24 +55,18 @@ class GUI(GUISettings):
             data (RubricsData): словарь рубрик.
         """
         self._enabled_interface(True)
-        list_rubrics = self.win.list_rubrics
-        list_rubrics.clear()
         self.win.parsing_firms.setEnabled(False)
-        for name, values in data.items():
-            item = QListWidgetItem(f'[Рубрика] {name}')
-            item.is_rubric = True
-            item.name = name
-            item.url = values['url']
-            subrubrics = values['subrubrics']
-            item.subrubrics = subrubrics
-            list_rubrics.addItem(item)
-            for subrubric in subrubrics:
-                name = subrubric['name']
-                item = QListWidgetItem(f'[Подрубрика] {name}')
-                item.name = name
-                item.is_rubric = False
-                item.url = subrubric['url']
-                list_rubrics.addItem(item)
+        self.rubrics_model.set_rubrics(data)
+
+    def _get_current_rubric(self) -> RubricItem | None:
+        """Отдаёт выбранную рубрику.
+
+        Returns:
+            RubricItem | None: выбранная рубрика.
+        """
+        return self.rubrics_model.get_item(
+            self.win.list_rubrics.currentIndex()
+        )
 
     def _enabled_interface(self, flag: bool) -> None:
         """Включение-отключение интерфейса.
@@ -90,20 +81,6 @@ class GUI(GUISettings):
         self.win.name_city.setEnabled(flag)
         self.win.slug_city.setEnabled(flag)
 
-    def _enabled_interface_save_form(self, flag: bool) -> None:
-        """Включение-отключение интерфейса сохранения фирм.
-
-        Args:
-            flag (bool): флаг активности.
-        """
-        self.save_form.url_api.setEnabled(flag)
-        self.save_form.auth_data.setEnabled(flag)
-        self.save_form.save_settings.setEnabled(flag)
-        self.save_form.set_file.setEnabled(flag)
-        self.save_form.slug_rubric.setEnabled(flag)
-        self.save_form.slug_city.setEnabled(flag)
-        self.save_form.send_rubric.setEnabled(flag)
-
     def _check_activity_elements(self, *arg, **kwarg) -> None:
         """Проверка активности элементов."""
         name_city = self.win.name_city
@@ -121,7 +98,7 @@ class GUI(GUISettings):
         if value_name and value_slug:
             parsing_rubrics.setEnabled(True)
             all_parsing.setEnabled(True)
-            if list_rubrics.currentItem():
+            if self._get_current_rubric():
                 parsing_firms.setEnabled(True)
             else:
                 parsing_firms.setEnabled(False)
@@ -136,14 +113,14 @@ class GUI(GUISettings):
         Args:
             value (str): значение поля.
         """
-        list_rubrics = self.win.list_rubrics
-        list_rubrics.clear()
+        self.rubrics_model.set_rubrics({})
 
         path_file = join('cities', value, 'rubrics.json')
         try:
-            if value and Path(path_file).exists():
-                with open(path_file, 'r') as file:
-                    self._display_rubrics(json.load(file))
+            if value:
+                self._display_rubrics(read_json(path_file))
+        except FileNotFoundError:
+            pass
         except Exception:
             self._set_row_in_console(
                 'Ошибка чтения файла рубрик',
@@ -152,44 +129,62 @@ class GUI(GUISettings):
             )
         self._check_activity_elements()
 
+    def _display_rubrics_city(self, slug_city: str, data: RubricsData) -> None:
+        """Выводит рубрики, если город не сменился за время парсинга.
+
+        Args:
+            slug_city (str): slug города.
+            data (RubricsData): словарь рубрик.
+        """
+        if self.win.slug_city.text() == slug_city:
+            self._display_rubrics(data)
+
     def _parsing_rubrics(self) -> None:
         """Запуск парсинга рубрик."""
-        self._enabled_interface(False)
-        self.thread = ParsingRubricsThread(
-            self._set_row_in_console,
-            self.win.slug_city.text(),
-            self.win.name_city.text(),
+        slug_city = self.win.slug_city.text()
+        name_city = self.win.name_city.text()
+        self.scheduler.add_job(
+            f'Парсинг рубрик [{slug_city}]',
+            'rubrics',
+            lambda: ParsingRubricsThread(
+                self._set_row_in_console,
+                slug_city,
+                name_city,
+            ),
+            lambda data: self._display_rubrics_city(slug_city, data),
         )
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.load_finished.connect(self._display_rubrics)
-        self.thread.start()
 
     def _parsing_firm_rubric(self) -> None:
         """Запуск парсинга фирм рубрики."""
-        self._enabled_interface(False)
-        self.thread = ParsingFirmRubricTread(
-            self._set_row_in_console,
-            self.win.list_rubrics.currentItem(),
-            self.win.slug_city.text(),
-            self.win.name_city.text(),
+        rubric = self._get_current_rubric()
+        slug_city = self.win.slug_city.text()
+        name_city = self.win.name_city.text()
+        self.scheduler.add_job(
+            f'Парсинг фирм "{rubric.name}" [{slug_city}]',
+            'firms',
+            lambda: ParsingFirmRubricTread(
+                self._set_row_in_console,
+                rubric,
+                slug_city,
+                name_city,
+            ),
         )
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.load_finished.connect(self._enabled_interface)
-        self.thread.start()
 
     def _parsing_firm_rubrics(self) -> None:
         """Парсинг фирм всех рубрик."""
-        self._enabled_interface(False)
-        self.thread = ParsingFirmRubricsThread(
-            self._set_row_in_console,
-            self.win.slug_city.text(),
-            self.win.name_city.text(),
+        slug_city = self.win.slug_city.text()
+        name_city = self.win.name_city.text()
+        self.scheduler.add_job(
+            f'Парсинг фирм всех рубрик [{slug_city}]',
+            'city',
+            lambda: ParsingFirmRubricsThread(
+                self._set_row_in_console,
+                slug_city,
+                name_city,
+            ),
         )
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.load_finished.connect(self._check_activity_elements)
-        self.thread.start()
 
-    def _change_rubric(self) -> None:
+    def _change_rubric(self, *arg, **kwarg) -> None:
         """Проверка изменения рубрики."""
         value_name = self.win.name_city.text()
         value_slug = self.win.slug_city.text()
@@ -279,9 +274,11 @@ class GUI(GUISettings):
 
     def _save_settings(self) -> None:
         """Сохранение настроек."""
+        incremental_upload = self.save_form.incremental_upload.isChecked()
         settings = {
             'URL_API': self.save_form.url_api.text(),
             'AUTH_DATA': self.save_form.auth_data.text(),
+            'INCREMENTAL_UPLOAD': incremental_upload,
         }
         with open('settings.json', 'w') as file:
             json.dump(settings, file)
@@ -306,6 +303,10 @@ class GUI(GUISettings):
                 auth_data = settings.get('AUTH_DATA', '')
                 self.save_form.url_api.setText(url_api)
                 self.save_form.auth_data.setText(auth_data)
+                self.save_form.incremental_upload.setChecked(
+                    settings.get('INCREMENTAL_UPLOAD', self.INCREMENTAL_UPLOAD)
+                    is True
+                )
                 self._change_url_api(url_api)
         except json.decoder.JSONDecodeError:
             return
@@ -314,11 +315,11 @@ class GUI(GUISettings):
         """Открывает диалоговое окно выбора json файла."""
         file_name, _ = QFileDialog.getOpenFileName(
             caption='Open Image',
-            filter='*.json',
+            filter='*.json *.json.gz',
         )
         if not file_name:
             return
-        if file_name.split('.')[-1] != 'json':
+        if not file_name.endswith(('.json', '.json.gz')):
             return
         self.save_form.path_file.setText(file_name)
         self._check_activity_button_send_rubric()
@@ -449,17 +450,16 @@ class GUI(GUISettings):
                 'red',
             )
         try:
-            with open(file_path, 'r') as file:
-                data = json.load(file)
-                if not self._validate_firms(data):
-                    self._set_message_save_form(
-                        'Невалидные данные',
-                        3,
-                        'red',
-                    )
-                    return
-                return data['firms']
-        except json.decoder.JSONDecodeError:
+            data = read_json(file_path)
+            if not self._validate_firms(data):
+                self._set_message_save_form(
+                    'Невалидные данные',
+                    3,
+                    'red',
+                )
+                return
+            return data['firms']
+        except (OSError, json.decoder.JSONDecodeError):
             self._set_message_save_form(
                 'Ошибка чтения файла',
                 3,
@@ -471,28 +471,35 @@ class GUI(GUISettings):
         firms = self._get_firms_in_file()
         if firms is None:
             return
-        self._enabled_interface_save_form(False)
-        self.thread_send_firms = SendFirmsToServerThread(
-            firms,
-            self.save_form.slug_city.text(),
-            self.save_form.slug_rubric.text(),
-            self.save_form.url_api.text(),
-            self._set_message_save_form,
-            self.save_form.auth_data.text(),
-        )
-        self.thread_send_firms.finished.connect(
-            self.thread_send_firms.deleteLater
-        )
-        self.thread_send_firms.load_finished.connect(
-            self._enabled_interface_save_form
+        slug_city = self.save_form.slug_city.text()
+        slug_rubric = self.save_form.slug_rubric.text()
+        url_api = self.save_form.url_api.text()
+        auth_data = self.save_form.auth_data.text()
+        self.scheduler.add_job(
+            f'Отправка фирм "{slug_rubric}" [{slug_city}]',
+            'upload',
+            lambda: SendFirmsToServerThread(
+                firms,
+                slug_city,
+                slug_rubric,
+                url_api,
+                self._set_message_save_form,
+                auth_data,
+                self.save_form.incremental_upload.isChecked(),
+            ),
         )
-        self.thread_send_firms.start()
 
     def _set_connects(self) -> None:
         """Устанавливает обработчики."""
         self.win.name_city.textChanged.connect(self._check_activity_elements)
         self.win.slug_city.textChanged.connect(self._change_slug_city)
-        self.win.list_rubrics.itemSelectionChanged.connect(self._change_rubric)
+        self.win.list_rubrics.selectionModel().selectionChanged.connect(
+            self._change_rubric
+        )
+        self.win.search_rubrics.textChanged.connect(
+            self.rubrics_model.set_filter
+        )
+        self.rubrics_model.modelReset.connect(self._check_activity_elements)
         self.win.parsing_rubrics.clicked.connect(self._parsing_rubrics)
         self.win.parsing_firms.clicked.connect(self._parsing_firm_rubric)
         self.win.all_parsing.clicked.connect(self._parsing_firm_rubrics)
@@ -512,8 +519,18 @@ class GUI(GUISettings):
     def __init__(self) -> None:
         """Инициализация GUI."""
         app = QtWidgets.QApplication([])
+        app.aboutToQuit.connect(driver_manager.shutdown)
+        app.aboutToQuit.connect(result_writer.close)
+        proxy_pool.load()
+        driver_manager.COUNT_WARM_DRIVERS = self.COUNT_WORKERS_JOBS
+        driver_manager.warm_up()
         self.win: QMainWindow = uic.loadUi(GUISettings.GUI_UI_PATH)
         self.save_form: QMainWindow = uic.loadUi(GUISettings.SAVE_FORM_UI_PATH)
+        self.rubrics_model = RubricsModel()
+        self.win.list_rubrics.setModel(self.rubrics_model)
+        self.log_sink = ConsoleLogSink(self.win.console)
+        app.aboutToQuit.connect(self.log_sink.close)
+        self.scheduler = JobScheduler(self.win.list_jobs)
         self._set_validators()
         self._set_connects()
         self._set_settings()
@@ -0,0 +1,174 @@
+from itertools import count
+from typing import Any, Callable
+import heapq
+import time
+
+from PyQt6.QtCore import QThread, QTimer
+from PyQt6.QtWidgets import QListWidget
+
+from settings import GUISettings
+
+
+class Job:
+    """Задача планировщика."""
+
+    STATE_QUEUED = 'в очереди'
+    STATE_RUNNING = 'выполняется'
+    STATE_FINISHED = 'завершена'
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        create_thread: Callable[[], QThread],
+        on_load_finished: Callable[[Any], None] | None = None,
+    ) -> None:
+        """Инициализация задачи.
+
+        Args:
+            name (str): название задачи.
+            kind (str): тип задачи.
+            create_thread (Callable[[], QThread]): создание потока задачи.
+            on_load_finished (Callable[[Any], None] | None, optional):
+                обработчик результата потока. Defaults to None.
+        """
+        self.name = name
+        self.kind = kind
+        self.create_thread = create_thread
+        self.on_load_finished = on_load_finished
+        self.thread: QThread | None = None
+        self.state = self.STATE_QUEUED
+        self.count_firms = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def _add_firms(self, count_firms: int) -> None:
+        """Учитывает спаршенные фирмы.
+
+        Args:
+            count_firms (int): кол-во фирм.
+        """
+        self.count_firms += count_firms
+
+    def __str__(self) -> str:
+        """Строка задачи для списка задач.
+
+        Returns:
+            str: строка задачи.
+        """
+        text = f'[{self.state}] {self.name}'
+        if self.started_at is None:
+            return text
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        text = f'{text} | {elapsed:.0f} с'
+        if self.count_firms:
+            text = (
+                f'{text} | фирм: {self.count_firms}, '
+                f'{self.count_firms / max(elapsed, 1):.1f}/с'
+            )
+        return text
+
+
+class JobScheduler(GUISettings):
+    """Планировщик задач парсинга и отправки данных."""
+
+    def __init__(self, list_jobs: QListWidget) -> None:
+        """Инициализация планировщика.
+
+        Args:
+            list_jobs (QListWidget): виджет списка задач.
+        """
+        self.list_jobs = list_jobs
+        self.queue: list[tuple[int, int, Job]] = []
+        self.counter = count()
+        self.jobs: list[Job] = []
+        self.count_running = 0
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._display_jobs)
+        self.timer.start(self.INTERVAL_UPDATE_JOBS)
+
+    def add_job(
+        self,
+        name: str,
+        kind: str,
+        create_thread: Callable[[], QThread],
+        on_load_finished: Callable[[Any], None] | None = None,
+    ) -> Job:
+        """Добавляет задачу в очередь.
+
+        Args:
+            name (str): название задачи.
+            kind (str): тип задачи из PRIORITIES_JOBS.
+            create_thread (Callable[[], QThread]): создание потока задачи.
+            on_load_finished (Callable[[Any], None] | None, optional):
+                обработчик результата потока. Defaults to None.
+
+        Returns:
+            Job: задача.
+        """
+        job = Job(name, kind, create_thread, on_load_finished)
+        heapq.heappush(
+            self.queue,
+            (self.PRIORITIES_JOBS[kind], next(self.counter), job),
+        )
+        self.jobs.append(job)
+        self._start_jobs()
+        self._display_jobs()
+        return job
+
+    def _start_jobs(self) -> None:
+        """Запускает задачи из очереди по приоритету."""
+        while self.queue and self.count_running < self.COUNT_WORKERS_JOBS:
+            _, _, job = heapq.heappop(self.queue)
+            self._start_job(job)
+
+    def _start_job(self, job: Job) -> None:
+        """Запускает задачу.
+
+        Args:
+            job (Job): задача.
+        """
+        job.thread = job.create_thread()
+        job.thread.finished.connect(job.thread.deleteLater)
+        job.thread.finished.connect(lambda: self._finish_job(job))
+        if job.on_load_finished:
+            job.thread.load_finished.connect(job.on_load_finished)
+        firms_parsed = getattr(job.thread, 'firms_parsed', None)
+        if firms_parsed is not None:
+            firms_parsed.connect(job._add_firms)
+        job.state = Job.STATE_RUNNING
+        job.started_at = time.monotonic()
+        self.count_running += 1
+        job.thread.start()
+
+    def _finish_job(self, job: Job) -> None:
+        """Завершает задачу и запускает следующие.
+
+        Args:
+            job (Job): задача.
+        """
+        job.state = Job.STATE_FINISHED
+        job.finished_at = time.monotonic()
+        job.thread = None
+        self.count_running -= 1
+        finished = [
+            old_job
+            for old_job in self.jobs
+            if old_job.state == Job.STATE_FINISHED
+        ]
+        for old_job in finished[: max(len(self.jobs) - self.MAX_ROW_JOBS, 0)]:
+            self.jobs.remove(old_job)
+        self._start_jobs()
+        self._display_jobs()
+
+    def _display_jobs(self) -> None:
+        """Выводит список задач."""
+        texts = [str(job) for job in reversed(self.jobs)]
+        if self.list_jobs.count() != len(texts):
+            self.list_jobs.clear()
+            self.list_jobs.addItems(texts)
+            return
+        for row, text in enumerate(texts):
+            item = self.list_jobs.item(row)
+            if item.text() != text:
+                item.setText(text)
@@ -0,0 +1,92 @@
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QListWidget, QListWidgetItem
+
+from settings import GUISettings
+
+
+class ConsoleLogSink(GUISettings):
+    """Потокобезопасный вывод логов в консоль GUI.
+
+    Записи копятся в кольцевом буфере из любых потоков и выводятся
+    пачкой по таймеру в потоке GUI.
+    """
+
+    def __init__(self, console: QListWidget) -> None:
+        """Инициализация вывода логов.
+
+        Args:
+            console (QListWidget): виджет консоли.
+        """
+        self.console = console
+        self.lock = Lock()
+        self.records: deque[tuple[str, str | None]] = deque(
+            maxlen=self.MAX_ROW_CONSOLE
+        )
+        self.lines_file: list[str] = []
+        self.file = None
+        if self.LOG_TO_FILE:
+            path = Path(self.LOG_FILE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(path, 'a', encoding='utf-8')
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(self.INTERVAL_FLUSH_CONSOLE)
+
+    def write(
+        self,
+        text: str,
+        color: str | None = None,
+        support_info: str = '',
+    ) -> None:
+        """Добавляет запись в буфер.
+
+        Args:
+            text (str): текст строчки.
+            color (str | None, optional): цвет текста. Defaults to None.
+            support_info (str): вспомогательная информация.
+        """
+        line = (
+            f'{datetime.now().strftime(self.FORMAT_TIME)} | {support_info} > '
+            f'{text}'
+        )
+        with self.lock:
+            self.records.append((line, color))
+            if self.file is not None:
+                self.lines_file.append(f'{line}\n')
+
+    def flush(self) -> None:
+        """Выводит накопленные записи в консоль."""
+        with self.lock:
+            records = list(self.records)
+            self.records.clear()
+            lines_file, self.lines_file = self.lines_file, []
+        if lines_file:
+            self.file.writelines(lines_file)
+            self.file.flush()
+        if not records:
+            return
+        console = self.console
+        console.setUpdatesEnabled(False)
+        count_remove = console.count() + len(records) - self.MAX_ROW_CONSOLE
+        if count_remove > 0:
+            console.model().removeRows(0, min(count_remove, console.count()))
+        for line, color in records:
+            item = QListWidgetItem(line)
+            if color:
+                item.setForeground(QColor(color))
+            console.addItem(item)
+        console.setUpdatesEnabled(True)
+
+    def close(self) -> None:
+        """Выводит оставшиеся записи и закрывает файл логов."""
+        self.timer.stop()
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,19 +1,77 @@
-from parser import Parser
-from gui import GUI
+from multiprocessing import freeze_support
+import logging
+
 from command_line import parser_command_line
 
 
 def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+    )
     arg_parser = parser_command_line()
     args = arg_parser.parse_args()
+    if args.probe and not args.daemon:
+        arg_parser.error('--probe работает только с --daemon')
     if args.gui:
+        from gui import GUI
+
         GUI()
         return
-    parser = Parser()
+    if args.index or args.serve:
+        from query_service import FirmsStore, serve
+
+        if args.index:
+            count = FirmsStore().index_city(args.slug)
+            print(f'Проиндексировано фирм: {count}')
+        if args.serve:
+            serve(port=args.port)
+        return
+    from driver_manager import driver_manager
+    from writer import result_writer
+    from proxy_pool import proxy_pool
+
+    proxy_pool.load(args.proxies)
+    result_writer.COMPRESS_RESULTS = args.compress
+    result_writer.FSYNC_POLICY = args.fsync
+    driver_manager.NAVIGATION_PROFILE = args.navigation_profile
+    driver_manager.PERSISTENT_PROFILE = args.persistent_profile
+    if args.replay:
+        from replay import ReplayParser
+
+        parser = ReplayParser(args.replay, args.replay_timing)
+    elif args.record:
+        from replay import RecordingParser
+
+        parser = RecordingParser(args.record)
+    elif args.profile:
+        from profiling import ProfilingParser
+
+        parser = ProfilingParser()
+    else:
+        from parser import Parser
+
+        parser = Parser()
     parser.VALIDATE_NAME_CITY = args.name
     parser.SLUG_CITY = args.slug
-    parser.parsing()
+    parser.PARSING_TWO_PHASE = args.two_phase
+    parser.PARSING_TILES = args.tiles
+    parser.CACHE_META_CITY = args.meta_cache
+    parser.DEDUP_FIRMS = args.dedup
+    parser.DECODE_FIRMS = args.decode
+    parser.PROBE_SUBRUBRICS = args.probe
+    try:
+        if args.daemon:
+            from recrawl import RecrawlScheduler
+
+            RecrawlScheduler(parser).run()
+        else:
+            parser.parsing()
+    finally:
+        parser.close()
+        driver_manager.shutdown()
 
 
 if '__main__' == __name__:
+    freeze_support()
     main()
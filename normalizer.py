@@ -0,0 +1,208 @@
+from typing import Any
+import json
+import re
+
+from settings import ParserSettings
+
+
+class FirmNormalizer(ParserSettings):
+    """Нормализация данных по фирмам из API 2GIS.
+
+    Не зависит от парсера и сериализуется, поэтому может работать
+    в процессах пула.
+    """
+
+    def __init__(self, validate_name_city: str) -> None:
+        """Инициализация нормализации.
+
+        Args:
+            validate_name_city (str): название города.
+        """
+        self.VALIDATE_NAME_CITY = validate_name_city
+
+    def _validate_address(self, firm: dict[str, Any]) -> bool:
+        """Вадилация адреса.
+
+        Args:
+            firm (dict[str, str]): данные по фирме.
+
+        Returns:
+            bool: флаг валидации.
+        """
+        for location in firm.get('adm_div', []):
+            if location['type'] != 'city':
+                continue
+            if location['name'] == self.VALIDATE_NAME_CITY:
+                return True
+            return False
+        return True
+
+    def _get_image(self, firm_data: dict[str, Any]) -> str:
+        """Отдаёт ссылку на изображение.
+
+        Args:
+            firm_data (dict[str, Any]): данные по фирме.
+
+        Returns:
+            str: ссылка на изображение.
+        """
+        external_content = firm_data.get('external_content')
+        if not external_content:
+            return ''
+        for photo in external_content:
+            if photo['subtype'] == 'common':
+                return photo['main_photo_url']
+        return ''
+
+    def _get_address(self, firm_data: dict[str, Any]) -> str:
+        """Отдаёт адрес фирмы.
+
+        Args:
+            firm_data (dict[str, Any]): данные по фирме.
+
+        Returns:
+            str: адрес фирмы.
+        """
+        address = firm_data.get('address_name')
+        if not address or len(address) > self.MAX_LEN_ADDRESS:
+            return self.VALIDATE_NAME_CITY
+        return address
+
+    def _get_contact(
+        self,
+        firm_data: dict[str, Any],
+        key: str,
+    ) -> str:
+        """Отдаёт контакт фирмы по ключу.
+
+        Args:
+            firm_data (dict[str, Any]): данные по фирме.
+            key (str): ключ контакта.
+
+        Returns:
+            str: контакт фирмы.
+        """
+        contact_groups = firm_data.get('contact_groups')
+        if not contact_groups:
+            return ''
+        for contact_group in contact_groups:
+            contacts = contact_group.get('contacts')
+            if not contacts:
+                continue
+            for contact in contacts:
+                if contact['type'] != key:
+                    continue
+                match key:
+                    case 'phone':
+                        value = contact['value']
+                        if value[0] == '8':
+                            value = f'+7{value[1:]}'
+                        if re.compile(self.REGULAR_PHONE).match(value):
+                            return value
+                        return ''
+                    case 'email':
+                        value = contact['value']
+                        if (
+                            re.compile(self.REGULAR_EMAIL).match(value)
+                            and len(value) <= self.MAX_LEN_EMAIL
+                        ):
+                            return value
+                        return ''
+                    case 'website':
+                        value = contact['url']
+                        if (
+                            re.compile(self.REGULAR_URL).match(value)
+                            and len(value) <= self.MAX_LEN_SITE
+                        ):
+                            return value
+                        return ''
+        return ''
+
+    def _get_work_schedule(
+        self,
+        firm_data: dict[str, Any],
+    ) -> dict[str, dict[str, str]]:
+        """Отдаёт расписание фирмы.
+
+        Args:
+            firm_data (dict[str, Any]): данные по фирме.
+
+        Returns:
+            dict[str, dict[str, str]]: расписание фирмы.
+        """
+        schedule: dict[str, list[dict[str, str]]] = firm_data.get(
+            'schedule', {}
+        )
+        if not schedule:
+            return schedule
+        return {
+            day: data['working_hours'][0]
+            for day, data in schedule.items()
+            if day not in self.KEYS_SKIP_SCHEDULE
+        }
+
+    def _get_name(self, firm: dict[str, Any]) -> str:
+        """Отдаёт название организации.
+
+        Args:
+            firm (dict[str, Any]): данные по фирме.
+
+        Returns:
+            str: название огранизации.
+        """
+        if name := firm.get('name_ex', {}).get('primary'):
+            return name
+        if name := firm.get('name'):
+            return name
+        return firm['full_name']
+
+    def normalize(self, firm: dict[str, Any]) -> dict[str, Any]:
+        """Отдаёт данные по фирме без филиалов и координат.
+
+        Args:
+            firm (dict[str, Any]): данные по фирме из API 2GIS.
+
+        Returns:
+            dict[str, Any]: данные по фирме, пустые - фирма из другого
+                города.
+        """
+        if not self._validate_address(firm):
+            return {}
+        return {
+            'org_id': firm.get('org', {'id': None})['id'],
+            'name': self._get_name(firm),
+            'phone': self._get_contact(firm, 'phone'),
+            'address': self._get_address(firm),
+            'email': self._get_contact(firm, 'email'),
+            'image_href': self._get_image(firm),
+            'site': self._get_contact(firm, 'website'),
+            'work_schedule': self._get_work_schedule(firm),
+        }
+
+
+def decode_page(body: bytes, normalizer: FirmNormalizer) -> dict[str, Any]:
+    """Декодирует страницу фирм API 2GIS и нормализует фирмы.
+
+    От фирм остаются только id, организация, координаты и
+    нормализованные данные.
+
+    Args:
+        body (bytes): тело ответа API 2GIS.
+        normalizer (FirmNormalizer): нормализация фирм.
+
+    Returns:
+        dict[str, Any]: кол-во и компактные данные по фирмам страницы.
+    """
+    result = json.loads(body).get('result') or {}
+    return {
+        'total': result.get('total', 0),
+        'items': [
+            {
+                'id': item.get('id'),
+                'org': item.get('org'),
+                'point': item.get('point'),
+                'firm_data': normalizer.normalize(item),
+            }
+            for item in result.get('items', [])
+        ],
+    }
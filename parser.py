@@ -1,79 +1,239 @@
-from urllib.parse import urljoin
-from typing import Any
+from urllib.parse import urljoin, urlparse, parse_qs, quote, urlencode
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from pathlib import Path
+from typing import Any, Callable, Iterator, TYPE_CHECKING
+import base64
+import hashlib
+import json
+import logging
+import math
 import re
+import time
 import asyncio
 
-import aiohttp
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver import Chrome, ChromeOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException
-
 from settings import ParserSettings
-from exceptions import NoCityOn2GISException
+from driver_manager import driver_manager
+from branch_cache import branch_cache
+from dedup import FirmsIndex
+from normalizer import FirmNormalizer, decode_page
+from proxy_pool import proxy_pool
+from exceptions import NoCityOn2GISException, ProxiesRejectedException
 from typings import RubricsData
+from writer import read_json, write_atomic
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+    from selenium.webdriver import Chrome
+
+logger = logging.getLogger(__name__)
+
 
+class AsyncParser(ParserSettings):
+    """Асинхронный парсер фирм в 2gis.
 
-class Parser(ParserSettings):
-    """Парсер фирм в 2gis."""
+    Все корутины работают в одном цикле событий, блокирующая работа
+    с Selenium выполняется в отдельном потоке.
+    """
 
     def __init__(self) -> None:
-        """Инициализация драйвера парсера."""
-        self.options = ChromeOptions()
-        for arg_option in self.ARGS_OPTION:
-            self.options.add_argument(arg_option)
-        self.options.add_experimental_option('detach', True)
-        self.options.set_capability(
-            'goog:loggingPrefs', {'performance': 'ALL'}
+        """Инициализация парсера.
+
+        Драйвер берётся из пула менеджера при первом обращении.
+        """
+        self._driver: 'Chrome | None' = None
+        self.count_navigations = 0
+        self.count_navigations_driver = 0
+        self.count_requests = 0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.executor_decode: Executor | None = None
+        self.normalizer: FirmNormalizer | None = None
+        self.session: 'ClientSession | None' = None
+        self.semaphore: asyncio.Semaphore | None = None
+        self.latencies_ready: deque[float] = deque(
+            maxlen=self.COUNT_LATENCIES_READY
+        )
+        self.meta_city: dict[str, Any] | None = None
+        self.firms_index: FirmsIndex | None = None
+        self.lock_meta_city = asyncio.Lock()
+        self.probes: dict[str, dict[str, Any]] = {}
+
+    @property
+    def driver(self) -> 'Chrome':
+        """Отдаёт драйвер парсера.
+
+        Returns:
+            Chrome: драйвер.
+        """
+        if self._driver is None:
+            self._driver = driver_manager.acquire()
+        return self._driver
+
+    def _release_driver(self) -> None:
+        """Возвращает драйвер в пул менеджера."""
+        if self._driver is not None:
+            driver_manager.release(self._driver, self.count_navigations_driver)
+            self._driver = None
+            self.count_navigations_driver = 0
+
+    def close(self) -> None:
+        """Возвращает драйвер в пул менеджера и закрывает пулы потоков."""
+        if self.executor_decode is not None:
+            self.executor_decode.shutdown()
+            self.executor_decode = None
+        self._release_driver()
+        self.count_navigations = 0
+        self.executor.shutdown()
+
+    async def _run_in_driver(self, func: Callable, *args: Any) -> Any:
+        """Выполняет работу с драйвером вне цикла событий.
+
+        Args:
+            func (Callable): функция работы с драйвером.
+            *args (Any): аргументы функции.
+
+        Returns:
+            Any: результат функции.
+        """
+        if not self.RUN_DRIVER_IN_EXECUTOR:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, func, *args
         )
-        self.service = Service(executable_path=ChromeDriverManager().install())
-        self.driver = Chrome(options=self.options, service=self.service)
-        self.driver.execute_cdp_cmd(
-            'Network.setBlockedURLs', {'urls': self.BLOCKED_URLS}
+
+    async def _get_session(self) -> 'ClientSession':
+        """Отдаёт общую HTTP-сессию парсера.
+
+        Returns:
+            ClientSession: HTTP-сессия.
+        """
+        import aiohttp
+
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={'User-Agent': self.USER_AGENT}
+            )
+            self.semaphore = asyncio.Semaphore(self.COUNT_CONCURRENT_REQUESTS)
+        return self.session
+
+    async def aclose(self) -> None:
+        """Закрывает HTTP-сессию парсера."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _navigate(self, url: str) -> None:
+        """Переходит по URL.
+
+        Драйвер, исчерпавший лимиты переходов или памяти, перед
+        переходом возвращается в пул и заменяется свежим.
+
+        Args:
+            url (str): URL страницы.
+        """
+        if self._driver is not None and driver_manager.is_exhausted(
+            self._driver, self.count_navigations_driver
+        ):
+            self._release_driver()
+        self.driver.get(url)
+        self.count_navigations += 1
+        self.count_navigations_driver += 1
+
+    def _get_timeout_ready(self) -> float:
+        """Отдаёт время ожидания по перцентилю задержек отрисовки.
+
+        Returns:
+            float: время ожидания в секундах.
+        """
+        if not self.latencies_ready:
+            return self.TIMEOUT_READY_PAGE
+        latencies = sorted(self.latencies_ready)
+        index = math.ceil(len(latencies) * self.PERCENTILE_READY / 100) - 1
+        return min(
+            max(
+                latencies[index] * self.FACTOR_TIMEOUT_READY,
+                self.MIN_TIMEOUT_READY,
+            ),
+            self.TIMEOUT_READY_PAGE,
         )
-        self.driver.execute_cdp_cmd('Network.enable', {})
 
     def _waiting_element(
         self,
-        time: int | float,
         selector: str,
-        by=By.CSS_SELECTOR,
-    ) -> None:
-        """Ожидание элемента.
+        selector_container: str | None = None,
+    ) -> bool:
+        """Ожидание элемента через MutationObserver страницы.
+
+        Если контейнер отрисован, а DOM не меняется INTERVAL_QUIET_DOM
+        без искомого элемента, ожидание завершается сразу.
 
         Args:
-            time (int): время ожидания.
-            selector (str): селектор элемента.
-            by (str): способ поиска элемента.
-        """
-        WebDriverWait(self.driver, time).until(
-            expected_conditions.presence_of_element_located(
-                (
-                    by,
-                    selector,
-                )
-            )
-        )
+            selector (str): CSS селектор элемента.
+            selector_container (str | None): CSS селектор контейнера
+                элемента. Defaults to None.
 
-    def _get_rubrics(self) -> list[tuple[str, str, str]]:
-        """Отдаёт список данных по рубрикам.
+        Raises:
+            TimeoutException: не дождались ни элемента, ни контейнера.
 
         Returns:
-            list[tuple[str, str]]: список данных по рубрикам.
+            bool: флаг наличия элемента.
+        """
+        from selenium.common.exceptions import TimeoutException
+
+        timeout = self._get_timeout_ready()
+        start = time.perf_counter()
+        is_present = self.driver.execute_async_script(
+            self.SCRIPT_WAITING_ELEMENT,
+            selector,
+            selector_container,
+            timeout * 1000,
+            self.INTERVAL_QUIET_DOM * 1000,
+        )
+        if is_present is None:
+            self.latencies_ready.append(timeout)
+            raise TimeoutException(f'Нет элемента "{selector}".')
+        if is_present:
+            self.latencies_ready.append(time.perf_counter() - start)
+        return is_present
+
+    def _get_page_rubrics(self) -> None:
+        """Переходит на страницу рубрик города.
+
+        Raises:
+            NoCityOn2GISException: город отсутствует в 2GIS.
         """
-        self.driver.get(
+        from selenium.common.exceptions import TimeoutException
+
+        driver_manager.warm_cache(self.SLUG_CITY)
+        self._navigate(
             urljoin(
                 f'{urljoin(self.WEBSITE, self.SLUG_CITY)}/',
                 self.SLUG_RUBRICS,
             )
         )
+        try:
+            self._waiting_element(f'a.{self.CLASS_RUBRICS}')
+        except TimeoutException:
+            pass
         if self.SLUG_CITY not in self.driver.current_url:
             raise NoCityOn2GISException(
                 f'Город "{self.SLUG_CITY}" отсутсвует.',
             )
+
+    def _get_rubrics(self) -> list[tuple[str, str, str]]:
+        """Отдаёт список данных по рубрикам.
+
+        Returns:
+            list[tuple[str, str]]: список данных по рубрикам.
+        """
+        from selenium.webdriver.common.by import By
+
+        self._get_page_rubrics()
         a_rubrics = self.driver.find_elements(
             By.CSS_SELECTOR, f'a.{self.CLASS_RUBRICS}'
         )
@@ -86,6 +246,16 @@ class Parser(ParserSettings):
             if f'/{self.SLUG_SUBRUBRICS}/' in a_rubric.get_attribute('href')
         ]
 
+    def _get_key_api(self) -> str:
+        """Отдаёт ключ API 2GIS со страницы рубрик.
+
+        Returns:
+            str: ключ API.
+        """
+        self._get_page_rubrics()
+        self._waiting_state()
+        return self.driver.execute_script('return __customcfg.webApiKey;')
+
     def _get_subrubrics(
         self,
         a_rubric: tuple[str, str],
@@ -100,13 +270,16 @@ class Parser(ParserSettings):
         Returns:
             list[tuple[str, str]]: список данных по подрубрикам.
         """
-        self.driver.get(a_rubric[1])
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import TimeoutException
+
+        self._navigate(a_rubric[1])
         if not is_subrubric_subrubric:
             selector = (
                 f'.{self.CLASS_CONTENT_BLOCK}:nth-child(2) '
                 f'a.{self.CLASS_RUBRICS}'
             )
-            self._waiting_element(5, selector)
+            self._waiting_element(selector)
             a_subrubrics = self.driver.find_elements(By.CSS_SELECTOR, selector)
         else:
             selector = (
@@ -114,13 +287,16 @@ class Parser(ParserSettings):
                 f'a.{self.CLASS_SUBRUBRICS}'
             )
             try:
-                self._waiting_element(5, selector)
-                a_subrubrics = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    selector,
+                is_present = self._waiting_element(
+                    selector, f'.{self.CLASS_CONTENT_BLOCK}'
                 )
             except TimeoutException:
-                a_subrubrics = []
+                is_present = False
+            a_subrubrics = (
+                self.driver.find_elements(By.CSS_SELECTOR, selector)
+                if is_present
+                else []
+            )
         data_subrubrics = []
         a_subrubrics_subrubric = []
         for a_subrubric in a_subrubrics:
@@ -150,153 +326,115 @@ class Parser(ParserSettings):
             )
         return data_subrubrics
 
-    def _validate_address(self, firm: dict[str, Any]) -> bool:
-        """Вадилация адреса.
-
-        Args:
-            firm (dict[str, str]): данные по фирме.
-
-        Returns:
-            bool: флаг валидации.
-        """
-        for location in firm.get('adm_div', []):
-            if location['type'] != 'city':
-                continue
-            if location['name'] == self.VALIDATE_NAME_CITY:
-                return True
-            return False
-        return True
-
-    def _get_image(self, firm_data: dict[str, Any]) -> str:
-        """Отдаёт ссылку на изображение.
-
-        Args:
-            firm_data (dict[str, Any]): данные по фирме.
-
-        Returns:
-            str: ссылка на изображение.
-        """
-        external_content = firm_data.get('external_content')
-        if not external_content:
-            return ''
-        for photo in external_content:
-            if photo['subtype'] == 'common':
-                return photo['main_photo_url']
-        return ''
+    def signal_parse_firms(self, *arg, **kwarg) -> None:
+        """Сигнал парсинга фирм."""
+        pass
 
-    def _get_address(self, firm_data: dict[str, Any]) -> str:
-        """Отдаёт адрес фирмы.
+    def _get_page_subrubric(self, url: str) -> None:
+        """Переходит на страницу подрубрики.
 
         Args:
-            firm_data (dict[str, Any]): данные по фирме.
-
-        Returns:
-            str: адрес фирмы.
+            url (str): URL подрубрики.
         """
-        address = firm_data.get('address_name')
-        if not address or len(address) > self.MAX_LEN_ADDRESS:
-            return self.VALIDATE_NAME_CITY
-        return address
+        if self.HARVEST_API_RESPONSES:
+            self.driver.get_log('performance')
+        self._navigate(url)
 
-    def _get_contact(
+    def _is_same_viewpoint(
         self,
-        firm_data: dict[str, Any],
-        key: str,
-    ) -> str:
-        """Отдаёт контакт фирмы по ключу.
+        query: dict[str, list[str]],
+        meta_data: dict[str, Any],
+    ) -> bool:
+        """Проверка совпадения области поиска запроса и meta данных.
 
         Args:
-            firm_data (dict[str, Any]): данные по фирме.
-            key (str): ключ контакта.
+            query (dict[str, list[str]]): параметры запроса.
+            meta_data (dict[str, Any]): meta данные.
 
         Returns:
-            str: контакт фирмы.
+            bool: флаг совпадения.
         """
-        contact_groups = firm_data.get('contact_groups')
-        if not contact_groups:
-            return ''
-        for contact_group in contact_groups:
-            contacts = contact_group.get('contacts')
-            if not contacts:
-                continue
-            for contact in contacts:
-                if contact['type'] != key:
-                    continue
-                match key:
-                    case 'phone':
-                        value = contact['value']
-                        if value[0] == '8':
-                            value = f'+7{value[1:]}'
-                        if re.compile(self.REGULAR_PHONE).match(value):
-                            return value
-                        return ''
-                    case 'email':
-                        value = contact['value']
-                        if (
-                            re.compile(self.REGULAR_EMAIL).match(value)
-                            and len(value) <= self.MAX_LEN_EMAIL
-                        ):
-                            return value
-                        return ''
-                    case 'website':
-                        value = contact['url']
-                        if (
-                            re.compile(self.REGULAR_URL).match(value)
-                            and len(value) <= self.MAX_LEN_SITE
-                        ):
-                            return value
-                        return ''
-        return ''
+        for key in ('viewpoint1', 'viewpoint2'):
+            try:
+                point = map(float, query[key][0].split(','))
+                point_meta = map(float, meta_data[key].split(','))
+            except (KeyError, ValueError):
+                return False
+            if any(
+                abs(value - value_meta) > self.ACCURACY_VIEWPOINT
+                for value, value_meta in zip(point, point_meta)
+            ):
+                return False
+        return True
 
-    def _get_work_schedule(
+    def _get_harvested_pages(
         self,
-        firm_data: dict[str, Any],
-    ) -> dict[str, dict[str, str]]:
-        """Отдаёт расписание фирмы.
-
-        Args:
-            firm_data (dict[str, Any]): данные по фирме.
-
-        Returns:
-            dict[str, dict[str, str]]: расписание фирмы.
-        """
-        schedule: dict[str, list[dict[str, str]]] = firm_data.get(
-            'schedule', {}
-        )
-        if not schedule:
-            return schedule
-        return {
-            day: data['working_hours'][0]
-            for day, data in schedule.items()
-            if day not in self.KEYS_SKIP_SCHEDULE
-        }
+        meta_data: dict[str, Any],
+    ) -> dict[int, dict[str, Any]]:
+        """Отдаёт страницы фирм, уже загруженные браузером.
 
-    def _get_name(self, firm: dict[str, Any]) -> str:
-        """Отдаёт название организации.
+        Ответы API берутся из performance-лога драйвера, если запрос
+        браузера совпадает с запросом парсера по рубрике, размеру
+        страницы, полям и области поиска. Ответы не в JSON пропускаются,
+        такие страницы запрашиваются у API.
 
         Args:
-            firm (dict[str, Any]): данные по фирме.
+            meta_data (dict[str, Any]): meta данные.
 
         Returns:
-            str: название огранизации.
+            dict[int, dict[str, Any]]: результаты API по номерам страниц.
         """
-        if name := firm.get('name_ex', {}).get('primary'):
-            return name
-        if name := firm.get('name'):
-            return name
-        return firm['full_name']
+        from selenium.common.exceptions import WebDriverException
 
-    def signal_parse_firms(self, *arg, **kwarg) -> None:
-        """Сигнал парсинга фирм."""
-        pass
+        fields = set(self.API_FIELDS.split(','))
+        pages = {}
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message['method'] != 'Network.responseReceived':
+                continue
+            url = urlparse(message['params']['response']['url'])
+            query = parse_qs(url.query)
+            if (
+                url.path != self.API_2GIS_ITEMS
+                or query.get('rubric_id') != [f'{meta_data['rubric_id']}']
+                or query.get('page_size') != [f'{self.SIZE_PAGE}']
+                or not fields <= set(query.get('fields', [''])[0].split(','))
+                or not self._is_same_viewpoint(query, meta_data)
+            ):
+                continue
+            try:
+                response = self.driver.execute_cdp_cmd(
+                    'Network.getResponseBody',
+                    {'requestId': message['params']['requestId']},
+                )
+            except WebDriverException:
+                continue
+            body = response.get('body', '')
+            try:
+                if response.get('base64Encoded'):
+                    body = base64.b64decode(body)
+                data = json.loads(body)
+            except ValueError:
+                continue
+            result = data.get('result') if isinstance(data, dict) else None
+            if result:
+                pages[int(query.get('page', ['1'])[0])] = result
+        return pages
 
-    def _get_page_subrubric(self, url: str) -> None:
-        """Переходит на страницу подрубрики.
+    def _waiting_state(self) -> None:
+        """Ожидание состояния страницы 2GIS.
 
-        Args:
-            url (str): URL подрубрики.
+        При стратегиях загрузки 'eager' и 'none' переход завершается
+        раньше, чем страница объявит __customcfg и initialState.
         """
-        self.driver.get(url)
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        WebDriverWait(self.driver, self.TIMEOUT_READY_PAGE).until(
+            lambda driver: driver.execute_script(
+                "return typeof __customcfg !== 'undefined' "
+                "&& typeof initialState !== 'undefined';"
+            )
+        )
 
     def _get_meta_data(self) -> dict[str, str | list[dict[str, float]]]:
         """Отдаёт meta данные 2GIS.
@@ -304,6 +442,7 @@ class Parser(ParserSettings):
         Returns:
             tuple[str, str]: meta данные.
         """
+        self._waiting_state()
         customcfg = self.driver.execute_script('return __customcfg;')
         tab_catalog = self.driver.execute_script(
             'return initialState.appContext.frames[0].tabCatalog;'
@@ -315,11 +454,6 @@ class Parser(ParserSettings):
             """
         )
         total = rubric_data['total']
-        count_page = total // self.SIZE_PAGE
-        if total % self.SIZE_PAGE:
-            count_page += 1
-        if total > self.MAX_PAGE:
-            total = self.MAX_PAGE
         viewpoint = tab_catalog['viewpoint']
         viewpoint1 = f'{viewpoint[0]['lon']},{viewpoint[0]['lat']}'
         viewpoint2 = f'{viewpoint[1]['lon']},{viewpoint[1]['lat']}'
@@ -328,9 +462,24 @@ class Parser(ParserSettings):
             'viewpoint1': viewpoint1,
             'viewpoint2': viewpoint2,
             'rubric_id': rubric_data['rubrId'],
-            'count_page': count_page,
+            'total': total,
+            'count_page': self._get_count_page(total),
         }
 
+    def _get_count_page(self, total: int) -> int:
+        """Отдаёт кол-во страниц с учётом ограничения API.
+
+        Args:
+            total (int): кол-во элементов.
+
+        Returns:
+            int: кол-во страниц.
+        """
+        count_page = total // self.SIZE_PAGE
+        if total % self.SIZE_PAGE:
+            count_page += 1
+        return min(count_page, self.MAX_PAGE)
+
     def _get_params_r(self, data: dict[str, str]) -> str:
         """Отдаёт параметр r для запроса.
 
@@ -340,16 +489,10 @@ class Parser(ParserSettings):
         Returns:
             str: параметр r.
         """
-        data_string = ''.join(data.values())
-        return self.driver.execute_script(f"""
-            const dataString = '{data_string}';
-            const dataStringLength = dataString.length;
-            let r = {self.MX};
-            for (let i = 0; i < dataStringLength; i += 1)
-                r = r * {self.GX} + dataString.charCodeAt(i),
-                r >>>= 0;
-            return r;
-        """)
+        r = self.MX
+        for char in ''.join(data.values()):
+            r = (r * self.GX + ord(char)) & 0xFFFFFFFF
+        return f'{r}'
 
     def _get_url_branches(
         self,
@@ -389,6 +532,48 @@ class Parser(ParserSettings):
             f'viewpoint2={meta_data['viewpoint2']}&r={data['r']}'
         )
 
+    def _get_url_api(
+        self,
+        api: str,
+        params: dict[str, str],
+        key: str,
+    ) -> str:
+        """Отдаёт подписанный URL запроса к API 2GIS.
+
+        Args:
+            api (str): путь API.
+            params (dict[str, str]): параметры запроса.
+            key (str): ключ API.
+
+        Returns:
+            str: URL запроса.
+        """
+        params = dict(sorted({**params, 'key': key}.items()))
+        data = {'api': api, **params, 'hash': self.API_HASH}
+        params['r'] = self._get_params_r(data)
+        return f'{self.API_2GIS}{api}?{urlencode(params)}'
+
+    def _get_url_rubric(self, rubric: dict[str, Any]) -> str:
+        """Отдаёт URL рубрики на сайте 2GIS.
+
+        Args:
+            rubric (dict[str, Any]): рубрика из API 2GIS.
+
+        Returns:
+            str: URL рубрики.
+        """
+        url_city = f'{urljoin(self.WEBSITE, self.SLUG_CITY)}/'
+        if rubric['type'] == 'group':
+            return urljoin(
+                url_city,
+                f'{self.SLUG_RUBRICS}/{self.SLUG_SUBRUBRICS}/{rubric['id']}',
+            )
+        return urljoin(
+            url_city,
+            f'{self.SLUG_SEARCH}/{quote(rubric['name'])}/'
+            f'{self.SLUG_RUBRIC_ID}/{rubric['id']}',
+        )
+
     def _get_url_firms_page(self, meta_data: dict[str, str], page: int) -> str:
         """Отдаёт URL страницы фирм.
 
@@ -401,7 +586,7 @@ class Parser(ParserSettings):
         """
         data = {
             'api': self.API_2GIS_ITEMS,
-            'fields': self.API_FIELDS,
+            'fields': meta_data.get('fields', self.API_FIELDS),
             'key': meta_data['key'],
             'page': f'{page}',
             'page_size': f'{self.SIZE_PAGE}',
@@ -419,6 +604,145 @@ class Parser(ParserSettings):
             f'viewpoint2={meta_data['viewpoint2']}&r={data['r']}'
         )
 
+    def _get_url_firms_details(
+        self,
+        meta_data: dict[str, str],
+        items_id: list[str],
+    ) -> str:
+        """Отдаёт URL данных по фирмам по их id.
+
+        Args:
+            meta_data (dict[str, str]): meta-данные.
+            items_id (list[str]): id фирм.
+
+        Returns:
+            str: URL фирм.
+        """
+        data = {
+            'api': self.API_2GIS_ITEMS_BY_ID,
+            'fields': self.API_FIELDS,
+            'id': ','.join(items_id),
+            'key': meta_data['key'],
+            'hash': self.API_HASH,
+        }
+        data['r'] = self._get_params_r(data)
+        return (
+            f'{self.API_2GIS}{data['api']}?id={data['id']}&'
+            f'fields={data['fields']}&key={data['key']}&r={data['r']}'
+        )
+
+    async def _get_body_from_api(self, url: str) -> bytes:
+        """Отдаёт тело ответа API 2GIS.
+
+        Ответ прокси с кодом из CODES_ERROR_PROXY повторяется через
+        другой прокси, всего COUNT_ATTEMPTS_PROXY попыток.
+
+        Args:
+            url (str): URL запроса.
+
+        Raises:
+            ProxiesRejectedException: все попытки отклонены прокси.
+
+        Returns:
+            bytes: тело ответа.
+        """
+        from aiohttp import ClientError
+
+        session = await self._get_session()
+        status = None
+        async with self.semaphore:
+            for attempt in range(self.COUNT_ATTEMPTS_PROXY, 0, -1):
+                proxy = await proxy_pool.acquire()
+                self.count_requests += 1
+                start = time.perf_counter()
+                try:
+                    async with session.get(
+                        url, proxy=proxy and proxy.url
+                    ) as response:
+                        if (
+                            proxy is None
+                            or response.status not in self.CODES_ERROR_PROXY
+                        ):
+                            body = await response.read()
+                            proxy_pool.release(
+                                proxy, time.perf_counter() - start
+                            )
+                            return body
+                        status = response.status
+                except (ClientError, asyncio.TimeoutError):
+                    if proxy is None or attempt == 1:
+                        proxy_pool.release(proxy)
+                        raise
+                proxy_pool.release(proxy)
+            raise ProxiesRejectedException(
+                f'Попытки запроса к API 2GIS ({self.COUNT_ATTEMPTS_PROXY}) '
+                f'отклонены прокси, последний код ответа: {status}'
+            )
+
+    async def _get_data_from_api(self, url: str) -> dict[str, Any]:
+        """Отдаёт ответ API 2GIS.
+
+        Args:
+            url (str): URL запроса.
+
+        Returns:
+            dict[str, Any]: ответ API 2GIS.
+        """
+        return json.loads(await self._get_body_from_api(url))
+
+    def _get_normalizer(self) -> FirmNormalizer:
+        """Отдаёт нормализацию фирм города парсера.
+
+        Returns:
+            FirmNormalizer: нормализация фирм.
+        """
+        if (
+            self.normalizer is None
+            or self.normalizer.VALIDATE_NAME_CITY != self.VALIDATE_NAME_CITY
+        ):
+            self.normalizer = FirmNormalizer(self.VALIDATE_NAME_CITY)
+        return self.normalizer
+
+    def _get_executor_decode(self) -> Executor:
+        """Отдаёт пул декодирования страниц фирм.
+
+        Returns:
+            Executor: пул потоков или процессов по DECODE_FIRMS.
+        """
+        if self.executor_decode is None:
+            if self.DECODE_FIRMS == 'process':
+                self.executor_decode = ProcessPoolExecutor(
+                    self.COUNT_WORKERS_DECODE
+                )
+            else:
+                self.executor_decode = ThreadPoolExecutor(
+                    self.COUNT_WORKERS_DECODE
+                )
+        return self.executor_decode
+
+    async def _get_result_from_api(self, url: str) -> dict[str, Any]:
+        """Отдаёт результат страницы фирм из API 2GIS.
+
+        При DECODE_FIRMS 'thread' и 'process' тело ответа декодируется
+        и фирмы нормализуются в пуле, цикл событий занят только
+        вводом-выводом.
+
+        Args:
+            url (str): URL запроса.
+
+        Returns:
+            dict[str, Any]: кол-во и данные по фирмам страницы.
+        """
+        if self.DECODE_FIRMS == 'loop':
+            data = await self._get_data_from_api(url)
+            return data.get('result') or {}
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor_decode(),
+            decode_page,
+            await self._get_body_from_api(url),
+            self._get_normalizer(),
+        )
+
     async def _get_branches_from_api(self, url: str) -> list[dict[str, Any]]:
         """Отдаёт филиалы фирмы.
 
@@ -428,10 +752,7 @@ class Parser(ParserSettings):
         Returns:
             list[dict[str, Any]]: филиалы фирмы.
         """
-        headers = {'User-Agent': self.USER_AGENT}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
+        data = await self._get_data_from_api(url)
         return data['result']['items']
 
     async def _get_branches(
@@ -442,7 +763,7 @@ class Parser(ParserSettings):
         """Отдаёт филиалы.
 
         Args:
-            firm (dict[str, Any]): URL запроса фирмы.
+            firm (dict[str, Any]): данные по фирме из API 2GIS.
             meta_data (dict[str, str]): мета данные для поиска.
 
         Returns:
@@ -451,9 +772,31 @@ class Parser(ParserSettings):
         branch_count = firm['org']['branch_count']
         if branch_count <= 1:
             return []
-        count_page = branch_count // self.SIZE_PAGE
-        if branch_count % self.SIZE_PAGE:
-            count_page += 1
+        return await branch_cache.get_or_fetch(
+            self.SLUG_CITY,
+            firm['org']['id'],
+            lambda: self._get_branches_from_pages(
+                firm, meta_data, branch_count
+            ),
+        )
+
+    async def _get_branches_from_pages(
+        self,
+        firm: dict[str, Any],
+        meta_data: dict[str, str],
+        branch_count: int,
+    ) -> list[dict[str, Any]]:
+        """Отдаёт филиалы со всех страниц API 2GIS.
+
+        Args:
+            firm (dict[str, Any]): данные по фирме из API 2GIS.
+            meta_data (dict[str, str]): мета данные для поиска.
+            branch_count (int): кол-во филиалов.
+
+        Returns:
+            list[dict[str, Any]]: филиалы.
+        """
+        count_page = self._get_count_page(branch_count)
         urls = [
             self._get_url_branches(firm, meta_data, page)
             for page in range(1, count_page + 1)
@@ -477,84 +820,265 @@ class Parser(ParserSettings):
         Returns:
             dict[str, str]: данные по фирме.
         """
-        if not self._validate_address(firm):
+        firm_data = firm.get('firm_data')
+        if firm_data is None:
+            firm_data = self._get_normalizer().normalize(firm)
+        if not firm_data:
             return {}
-        org_id = firm.get('org', {'id': None})['id']
-        firm = {
-            'org_id': org_id,
-            'name': self._get_name(firm),
-            'phone': self._get_contact(firm, 'phone'),
-            'address': self._get_address(firm),
-            'email': self._get_contact(firm, 'email'),
-            'image_href': self._get_image(firm),
-            'site': self._get_contact(firm, 'website'),
-            'work_schedule': self._get_work_schedule(firm),
-        }
+        org_id = firm_data['org_id']
         if self.PARSING_BRANCHES and org_id:
-            firm['branches'] = await self._get_branches(firm, meta_data)
-        return firm
+            firm_data['branches'] = await self._get_branches(firm, meta_data)
+        if self.DEDUP_FIRMS != 'keep':
+            firm_data['point'] = firm.get('point')
+        return firm_data
 
-    async def _get_firms_from_api(
+    async def _get_items_page(
         self,
-        url: str,
         meta_data: dict[str, str],
-    ) -> list[dict[str, str]]:
-        """Отдаёт данные по фирмам из API 2GIS.
+        page: int,
+    ) -> dict[str, Any]:
+        """Отдаёт результат страницы фирм из API 2GIS.
 
         Args:
-            url (str): URL запроса страницы фирм.
             meta_data (dict[str, str]): мета данные для поиска.
+            page (int): страница фирм.
 
         Returns:
-            dict[str, str]: данные по фирмам из API 2GIS.
+            dict[str, Any]: кол-во и данные по фирмам страницы.
         """
-        headers = {'User-Agent': self.USER_AGENT}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
-        firms = []
-        result = data.get('result')
-        if not result:
-            return []
-        for firm in data['result']['items']:
-            firm = await self._get_firm_data(firm, meta_data)
-            if firm:
-                firms.append(firm)
-        return firms
+        harvested_page = meta_data.get('pages', {}).get(page)
+        if harvested_page is not None:
+            return harvested_page
+        return await self._get_result_from_api(
+            self._get_url_firms_page(meta_data, page)
+        )
 
-    async def _get_firms_data(
+    async def _get_items_pages(
         self,
         meta_data: dict[str, str],
-    ) -> list[dict[str, str]]:
-        """Получает данные по фирмам из API.
+        count_page: int,
+        first_page: int = 1,
+    ) -> list[dict[str, Any]]:
+        """Отдаёт данные по фирмам со страниц API 2GIS.
 
-        meta_data (dict[str, str]): мета данные для поиска.
+        Args:
+            meta_data (dict[str, str]): мета данные для поиска.
+            count_page (int): кол-во страниц.
+            first_page (int): первая запрашиваемая страница.
 
         Returns:
-            list[dict[str, str]]: список данных по фирмам.
+            list[dict[str, Any]]: данные по фирмам из API 2GIS.
         """
-        urls = [
-            self._get_url_firms_page(meta_data, page)
-            for page in range(1, meta_data['count_page'] + 1)
-        ]
-        all_firms = []
-        for firms in await asyncio.gather(
-            *[self._get_firms_from_api(url, meta_data) for url in urls]
+        items = []
+        for result in await asyncio.gather(
+            *[
+                self._get_items_page(meta_data, page)
+                for page in range(first_page, count_page + 1)
+            ]
         ):
-            if firms:
-                all_firms.extend(firms)
-        return all_firms
+            items.extend(result.get('items', []))
+        return items
 
-    def _excludes_paired_firms(
+    def _split_tile(self, meta_data: dict[str, str]) -> list[dict[str, str]]:
+        """Делит прямоугольник поиска на четыре тайла.
+
+        Args:
+            meta_data (dict[str, str]): мета данные для поиска.
+
+        Returns:
+            list[dict[str, str]]: мета данные тайлов.
+        """
+        lon1, lat1 = map(float, meta_data['viewpoint1'].split(','))
+        lon2, lat2 = map(float, meta_data['viewpoint2'].split(','))
+        lon_middle = (lon1 + lon2) / 2
+        lat_middle = (lat1 + lat2) / 2
+        meta_data = {
+            key: value for key, value in meta_data.items() if key != 'pages'
+        }
+        return [
+            {
+                **meta_data,
+                'viewpoint1': f'{lon_from:.6f},{lat_from:.6f}',
+                'viewpoint2': f'{lon_to:.6f},{lat_to:.6f}',
+            }
+            for lon_from, lon_to in ((lon1, lon_middle), (lon_middle, lon2))
+            for lat_from, lat_to in ((lat1, lat_middle), (lat_middle, lat2))
+        ]
+
+    async def _get_items_tile(
         self,
-        firms: list[dict[str, Any]],
-        orgs_id: set[str],
+        meta_data: dict[str, str],
+        depth: int = 0,
     ) -> list[dict[str, Any]]:
-        """Исключает уже спаршенные фирмы.
+        """Отдаёт данные по фирмам тайла.
+
+        Тайл рекурсивно делится на четыре, пока кол-во фирм в нём
+        превышает MAX_TOTAL_TILE.
 
         Args:
-            firms (list[dict[str, str]]): фирмы страницы.
-            orgs_id (set[str]): id спаршенных организаций.
+            meta_data (dict[str, str]): мета данные тайла.
+            depth (int): глубина деления.
+
+        Returns:
+            list[dict[str, Any]]: данные по фирмам из API 2GIS.
+        """
+        result = await self._get_items_page(meta_data, 1)
+        total = result.get('total', 0)
+        if total > self.MAX_TOTAL_TILE and depth < self.MAX_DEPTH_TILE:
+            items = []
+            for tile_items in await asyncio.gather(
+                *[
+                    self._get_items_tile(tile, depth + 1)
+                    for tile in self._split_tile(meta_data)
+                ]
+            ):
+                items.extend(tile_items)
+            return items
+        items = result.get('items', [])
+        items.extend(
+            await self._get_items_pages(
+                meta_data, self._get_count_page(total), 2
+            )
+        )
+        return items
+
+    async def _get_items(
+        self,
+        meta_data: dict[str, str],
+    ) -> list[dict[str, Any]]:
+        """Отдаёт данные по фирмам подрубрики без дубликатов.
+
+        Args:
+            meta_data (dict[str, str]): мета данные для поиска.
+
+        Returns:
+            list[dict[str, Any]]: данные по фирмам из API 2GIS.
+        """
+        if self.PARSING_TILES and meta_data['total'] > self.MAX_TOTAL_TILE:
+            items = await self._get_items_tile(meta_data)
+        else:
+            items = await self._get_items_pages(
+                meta_data, meta_data['count_page']
+            )
+        return self._excludes_paired_items(items)
+
+    def _excludes_paired_items(
+        self,
+        items: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Исключает повторы фирм, полученных из разных тайлов.
+
+        Args:
+            items (list[dict[str, Any]]): данные по фирмам из API 2GIS.
+
+        Returns:
+            list[dict[str, Any]]: данные по фирмам без повторов.
+        """
+        no_duplicates_items = []
+        items_id = set()
+        for item in items:
+            item_id = item.get('id')
+            if item_id in items_id:
+                continue
+            no_duplicates_items.append(item)
+            if item_id:
+                items_id.add(item_id)
+        return no_duplicates_items
+
+    async def _get_items_details(
+        self,
+        meta_data: dict[str, str],
+        items: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Отдаёт полные данные по фирмам пачками по id.
+
+        Args:
+            meta_data (dict[str, str]): мета данные для поиска.
+            items (list[dict[str, Any]]): фирмы с минимальными данными.
+
+        Returns:
+            list[dict[str, Any]]: данные по фирмам из API 2GIS.
+        """
+        items_id = [item['id'] for item in items]
+        urls = [
+            self._get_url_firms_details(
+                meta_data, items_id[index : index + self.SIZE_BATCH_DETAILS]
+            )
+            for index in range(0, len(items_id), self.SIZE_BATCH_DETAILS)
+        ]
+        details = []
+        for result in await asyncio.gather(
+            *[self._get_result_from_api(url) for url in urls]
+        ):
+            details.extend(result.get('items', []))
+        return details
+
+    async def _get_items_two_phase(
+        self,
+        meta_data: dict[str, str],
+        orgs_id: set[str],
+    ) -> list[dict[str, Any]]:
+        """Отдаёт данные по фирмам в два этапа.
+
+        Сначала запрашиваются только id фирм, затем полные данные
+        запрашиваются лишь для ещё не спаршенных организаций,
+        по одной фирме на организацию.
+
+        Args:
+            meta_data (dict[str, str]): мета данные для поиска.
+            orgs_id (set[str]): id спаршенных организаций.
+
+        Returns:
+            list[dict[str, Any]]: данные по фирмам из API 2GIS.
+        """
+        items = await self._get_items(
+            {**meta_data, 'fields': self.API_FIELDS_IDS}
+        )
+        new_items = []
+        new_orgs_id = set()
+        for item in items:
+            org_id = item.get('org', {}).get('id')
+            if org_id in orgs_id or org_id in new_orgs_id:
+                continue
+            new_items.append(item)
+            if org_id:
+                new_orgs_id.add(org_id)
+        return await self._get_items_details(meta_data, new_items)
+
+    async def _get_firms_data(
+        self,
+        meta_data: dict[str, str],
+        orgs_id: set[str] | None = None,
+    ) -> list[dict[str, str]]:
+        """Получает данные по фирмам из API.
+
+        meta_data (dict[str, str]): мета данные для поиска.
+        orgs_id (set[str] | None): id спаршенных организаций.
+
+        Returns:
+            list[dict[str, str]]: список данных по фирмам.
+        """
+        if self.PARSING_TWO_PHASE:
+            items = await self._get_items_two_phase(
+                meta_data, orgs_id or set()
+            )
+        else:
+            items = await self._get_items(meta_data)
+        firms = await asyncio.gather(
+            *[self._get_firm_data(item, meta_data) for item in items]
+        )
+        return [firm for firm in firms if firm]
+
+    def _excludes_paired_firms(
+        self,
+        firms: list[dict[str, Any]],
+        orgs_id: set[str],
+    ) -> list[dict[str, Any]]:
+        """Исключает уже спаршенные фирмы.
+
+        Args:
+            firms (list[dict[str, str]]): фирмы страницы.
+            orgs_id (set[str]): id спаршенных организаций.
 
         Returns:
             list[dict[str, Any]]: не спаршенные фирмы.
@@ -571,51 +1095,672 @@ class Parser(ParserSettings):
                 new_orgs_id.add(org_id)
         return no_duplicates_firms
 
-    def _get_firms(
-        self,
-        a_subrubric: tuple[str, str],
-        orgs_id: set[str] = set(),
-    ) -> tuple[list[dict[str, str]], set[str]]:
-        """Отдаёт список данных по фирмам.
+    def _get_subrubric_meta_data(self, url: str) -> dict[str, Any]:
+        """Переходит на страницу подрубрики и отдаёт её meta данные.
 
         Args:
-            a_subrubric (tuple[str, str]):  данные по подрубрике.
-            orgs_id (list[str]):  id спаршенных организаций.
+            url (str): URL подрубрики.
 
         Returns:
-            tuple[list[dict[str, str]], set[str]]:
-             список данных по фирмам и спаршенные организации.
+            dict[str, Any]: meta данные.
         """
-        self._get_page_subrubric(a_subrubric[1])
+        self._get_page_subrubric(url)
         meta_data = self._get_meta_data()
-        firms = asyncio.run(self._get_firms_data(meta_data))
+        if self.CACHE_META_CITY:
+            self._save_meta_city(meta_data)
+        if self.HARVEST_API_RESPONSES:
+            meta_data['pages'] = self._get_harvested_pages(meta_data)
+        return meta_data
+
+    def _get_path_meta_city(self) -> Path:
+        """Отдаёт путь к файлу meta данных города.
+
+        Returns:
+            Path: путь к файлу.
+        """
+        return self._get_path_data(self.NAME_META_CITY)
+
+    def _load_meta_city(self) -> dict[str, Any] | None:
+        """Отдаёт действующие meta данные города.
+
+        Returns:
+            dict[str, Any] | None: ключ API и область поиска города.
+        """
+        is_from_file = self.meta_city is None
+        if is_from_file:
+            try:
+                with open(self._get_path_meta_city(), 'r') as file:
+                    self.meta_city = json.load(file)
+            except (OSError, json.decoder.JSONDecodeError):
+                return None
+        if (
+            not isinstance(self.meta_city, dict)
+            or not all(
+                isinstance(self.meta_city.get(key), str)
+                for key in self.KEYS_META_CITY
+            )
+            or time.time() - self.meta_city.get('time', 0) > self.TTL_META_CITY
+        ):
+            self.meta_city = None
+            return None
+        if is_from_file:
+            logger.info(
+                'Meta данные города "%s" взяты из кэша, возраст %.0f с',
+                self.SLUG_CITY,
+                time.time() - self.meta_city.get('time', 0),
+            )
+        return self.meta_city
+
+    def _save_meta_city(self, meta_data: dict[str, Any]) -> None:
+        """Сохраняет meta данные города.
+
+        Args:
+            meta_data (dict[str, Any]): meta данные подрубрики.
+        """
+        self.meta_city = {key: meta_data[key] for key in self.KEYS_META_CITY}
+        self.meta_city['time'] = time.time()
+        write_atomic(
+            self._get_path_meta_city(), json.dumps(self.meta_city).encode()
+        )
+
+    def _reset_meta_city(self) -> None:
+        """Сбрасывает meta данные города."""
+        self.meta_city = None
+        self._get_path_meta_city().unlink(missing_ok=True)
+
+    async def _get_subrubric_meta_data_from_api(
+        self,
+        url: str,
+    ) -> dict[str, Any] | None:
+        """Отдаёт meta данные подрубрики без перехода браузера.
+
+        Ключ API и область поиска берутся из meta данных города,
+        id рубрики из URL подрубрики, кол-во фирм из первой страницы
+        API. Отклонённый ключ сбрасывает meta данные города, ответ
+        не в JSON приводит к переходу браузера.
+
+        Args:
+            url (str): URL подрубрики.
+
+        Returns:
+            dict[str, Any] | None: meta данные, None - нужен переход.
+        """
+        meta_city = self._load_meta_city()
+        rubric_id = re.search(self.REGULAR_RUBRIC_ID, url)
+        if meta_city is None or rubric_id is None:
+            return None
+        meta_data = {key: meta_city[key] for key in self.KEYS_META_CITY}
+        meta_data['rubric_id'] = rubric_id.group(1)
+        try:
+            data = await self._get_data_from_api(
+                self._get_url_firms_page(meta_data, 1)
+            )
+        except ValueError:
+            logger.warning(
+                'Ответ API не в JSON, meta данные подрубрики со страницы',
+                exc_info=True,
+            )
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get('meta', {}).get('code') in self.API_CODES_INVALID_KEY:
+            self._reset_meta_city()
+            return None
+        result = data.get('result') or {}
+        total = result.get('total', 0)
+        meta_data['total'] = total
+        meta_data['count_page'] = self._get_count_page(total)
+        meta_data['pages'] = {1: result}
+        return meta_data
+
+    def _get_path_data(self, name_file: str) -> Path:
+        """Отдаёт путь к данным города.
+
+        Args:
+            name_file (str): название файла.
+
+        Returns:
+            Path: путь к файлу.
+        """
+        return Path(
+            'cities', self.SLUG_CITY, f'{name_file.replace('/', '')}.json'
+        )
+
+    async def _get_probe(self, meta_data: dict[str, Any]) -> dict[str, Any]:
+        """Отдаёт пробу подрубрики.
+
+        Проба - кол-во фирм и отпечаток id фирм первой страницы.
+        Первая страница берётся из meta данных, иначе запрашивается
+        с минимальным набором полей.
+
+        Args:
+            meta_data (dict[str, Any]): meta данные.
+
+        Returns:
+            dict[str, Any]: проба.
+        """
+        result = meta_data.get('pages', {}).get(1)
+        if result is None:
+            data = await self._get_data_from_api(
+                self._get_url_firms_page(
+                    {**meta_data, 'fields': self.API_FIELDS_IDS}, 1
+                )
+            )
+            result = data.get('result') or {}
+        items_id = [
+            item['id']
+            for item in result.get('items', [])[: self.COUNT_ITEMS_PROBE]
+        ]
+        return {
+            'total': result.get('total', meta_data['total']),
+            'fingerprint': hashlib.sha1(
+                ','.join(items_id).encode()
+            ).hexdigest(),
+            'time': time.time(),
+        }
+
+    def _is_same_probe(
+        self,
+        probe: dict[str, Any],
+        last_probe: dict[str, Any] | None,
+    ) -> bool:
+        """Проверка неизменности подрубрики по пробам.
+
+        Args:
+            probe (dict[str, Any]): текущая проба.
+            last_probe (dict[str, Any] | None): проба последнего
+                парсинга.
+
+        Returns:
+            bool: флаг неизменности.
+        """
+        if not isinstance(last_probe, dict):
+            return False
+        try:
+            return (
+                probe['time'] - last_probe['time'] <= self.TTL_PROBE
+                and probe['fingerprint'] == last_probe['fingerprint']
+                and abs(probe['total'] - last_probe['total'])
+                <= self.TOLERANCE_TOTAL_PROBE * max(last_probe['total'], 1)
+            )
+        except (KeyError, TypeError):
+            return False
+
+    def _load_subrubric_data(
+        self,
+        name_subrubric: str,
+    ) -> dict[str, Any] | None:
+        """Отдаёт сохранённые данные подрубрики.
+
+        Args:
+            name_subrubric (str): название подрубрики.
+
+        Returns:
+            dict[str, Any] | None: фирмы и проба, None - данных нет.
+        """
+        try:
+            data = read_json(self._get_path_data(name_subrubric))
+        except (OSError, json.decoder.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or not isinstance(
+            data.get('firms'), list
+        ):
+            return None
+        return data
+
+    def _load_firms(self, name_subrubric: str) -> list[dict[str, Any]] | None:
+        """Отдаёт сохранённые фирмы подрубрики.
+
+        Args:
+            name_subrubric (str): название подрубрики.
+
+        Returns:
+            list[dict[str, Any]] | None: фирмы, None - данных нет.
+        """
+        data = self._load_subrubric_data(name_subrubric)
+        return None if data is None else data['firms']
+
+    def _get_subrubric_data(
+        self,
+        name_subrubric: str,
+        firms: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Отдаёт данные подрубрики для сохранения.
+
+        Проба подрубрики сохраняется в одном файле с фирмами,
+        по которым она снята, поэтому совпавшая проба всегда
+        указывает на актуальные фирмы.
+
+        Args:
+            name_subrubric (str): название подрубрики.
+            firms (list[dict[str, Any]]): фирмы подрубрики.
+
+        Returns:
+            dict[str, Any]: фирмы и проба, если она снималась.
+        """
+        data = {'firms': firms}
+        if name_subrubric in self.probes:
+            data['probe'] = self.probes[name_subrubric]
+        return data
+
+    @contextmanager
+    def _scope_firms_index(self) -> Iterator[FirmsIndex]:
+        """Ограничивает индекс близких дубликатов одним парсингом.
+
+        Вложенные парсинги рубрик и подрубрик используют индекс
+        внешнего парсинга, по завершении внешнего индекс удаляется.
+
+        Yields:
+            Iterator[FirmsIndex]: индекс парсинга.
+        """
+        if self.firms_index is not None:
+            yield self.firms_index
+            return
+        self.firms_index = FirmsIndex()
+        try:
+            yield self.firms_index
+        finally:
+            self.firms_index = None
+
+    def _merge_firms(
+        self,
+        name_subrubric: str,
+        firms: list[dict[str, str]],
+        orgs_id: set[str],
+    ) -> list[dict[str, str]]:
+        """Исключает дубликаты фирм подрубрики и дополняет id организаций.
+
+        Args:
+            name_subrubric (str): название подрубрики.
+            firms (list[dict[str, str]]): фирмы подрубрики.
+            orgs_id (set[str]): id спаршенных организаций.
+
+        Returns:
+            list[dict[str, str]]: фирмы без дубликатов.
+        """
         count_firms = len(firms)
         firms = self._excludes_paired_firms(firms, orgs_id)
+        with self._scope_firms_index() as firms_index:
+            firms = firms_index.dedup(firms, self.DEDUP_FIRMS)
         count_no_duplicates_firms = len(firms)
         count_duplicates_firms = count_firms - count_no_duplicates_firms
         orgs_id.update([firm['org_id'] for firm in firms if firm['org_id']])
         self.signal_parse_firms(
-            a_subrubric[0],
+            name_subrubric,
             count_no_duplicates_firms,
             count_duplicates_firms,
         )
+        return firms
+
+    async def _get_subrubric_firms(
+        self,
+        a_subrubric: tuple[str, str],
+        orgs_id: set[str],
+    ) -> list[dict[str, str]]:
+        """Отдаёт фирмы подрубрики без исключения дубликатов.
+
+        meta данные берутся из API по meta данным города, иначе
+        переходом браузера. Под блокировкой API запрашивается
+        повторно, только если meta данные города появились
+        за время ожидания.
+
+        При PROBE_SUBRUBRICS неизменная по пробе подрубрика
+        не парсится, отдаются сохранённые вместе с пробой фирмы.
+
+        Args:
+            a_subrubric (tuple[str, str]): данные по подрубрике.
+            orgs_id (set[str]): id спаршенных организаций.
+
+        Returns:
+            list[dict[str, str]]: фирмы подрубрики.
+        """
+        meta_data = None
+        if self.CACHE_META_CITY:
+            meta_data = await self._get_subrubric_meta_data_from_api(
+                a_subrubric[1]
+            )
+        if meta_data is None:
+            meta_city = self.meta_city
+            async with self.lock_meta_city:
+                if (
+                    self.CACHE_META_CITY
+                    and self.meta_city is not None
+                    and self.meta_city is not meta_city
+                ):
+                    meta_data = await self._get_subrubric_meta_data_from_api(
+                        a_subrubric[1]
+                    )
+                if meta_data is None:
+                    meta_data = await self._run_in_driver(
+                        self._get_subrubric_meta_data, a_subrubric[1]
+                    )
+        if not self.PROBE_SUBRUBRICS:
+            return await self._get_firms_data(meta_data, orgs_id)
+        probe = await self._get_probe(meta_data)
+        data = self._load_subrubric_data(a_subrubric[0])
+        if data is not None and self._is_same_probe(probe, data.get('probe')):
+            self.probes[a_subrubric[0]] = data['probe']
+            return data['firms']
+        firms = await self._get_firms_data(meta_data, orgs_id)
+        self.probes[a_subrubric[0]] = probe
+        return firms
+
+    async def parse_subrubric(
+        self,
+        a_subrubric: tuple[str, str],
+        orgs_id: set[str] | None = None,
+    ) -> tuple[list[dict[str, str]], set[str]]:
+        """Парсинг фирм подрубрики.
+
+        Args:
+            a_subrubric (tuple[str, str]): данные по подрубрике.
+            orgs_id (set[str] | None): id спаршенных организаций.
+
+        Returns:
+            tuple[list[dict[str, str]], set[str]]:
+             список данных по фирмам и спаршенные организации.
+        """
+        if orgs_id is None:
+            orgs_id = set()
+        with self._scope_firms_index():
+            firms = await self._get_subrubric_firms(a_subrubric, orgs_id)
+            firms = self._merge_firms(a_subrubric[0], firms, orgs_id)
         return firms, orgs_id
 
-    def parsing(self) -> RubricsData:
+    def signal_parse_rubric(self, *arg, **kwarg) -> None:
+        """Сигнал парсинга рубрики."""
+        pass
+
+    async def _get_region_id(self, key: str) -> str:
+        """Отдаёт id региона города в API 2GIS.
+
+        Args:
+            key (str): ключ API.
+
+        Raises:
+            NoCityOn2GISException: город отсутствует в 2GIS.
+
+        Returns:
+            str: id региона.
+        """
+        data = await self._get_data_from_api(
+            self._get_url_api(
+                self.API_2GIS_REGIONS, {'q': self.SLUG_CITY}, key
+            )
+        )
+        regions = data.get('result', {}).get('items', [])
+        for region in regions:
+            if region.get('code') == self.SLUG_CITY:
+                return region['id']
+        if not regions:
+            raise NoCityOn2GISException(
+                f'Город "{self.SLUG_CITY}" отсутсвует.',
+            )
+        return regions[0]['id']
+
+    async def _get_rubrics_from_api(
+        self,
+        key: str,
+        region_id: str,
+        parent_id: str,
+    ) -> list[dict[str, Any]]:
+        """Отдаёт дочерние рубрики из API 2GIS.
+
+        Args:
+            key (str): ключ API.
+            region_id (str): id региона.
+            parent_id (str): id родительской рубрики.
+
+        Returns:
+            list[dict[str, Any]]: рубрики.
+        """
+        data = await self._get_data_from_api(
+            self._get_url_api(
+                self.API_2GIS_RUBRICS,
+                {'region_id': region_id, 'parent_id': parent_id},
+                key,
+            )
+        )
+        return data['result']['items']
+
+    async def _get_subrubrics_from_api(
+        self,
+        key: str,
+        region_id: str,
+        rubric: dict[str, Any],
+    ) -> list[dict[str, str]]:
+        """Отдаёт подрубрики рубрики с учётом вложенных групп.
+
+        Args:
+            key (str): ключ API.
+            region_id (str): id региона.
+            rubric (dict[str, Any]): рубрика из API 2GIS.
+
+        Returns:
+            list[dict[str, str]]: подрубрики.
+        """
+        children = await self._get_rubrics_from_api(
+            key, region_id, rubric['id']
+        )
+        groups = [child for child in children if child['type'] == 'group']
+        subrubrics = [
+            {'name': child['name'], 'url': self._get_url_rubric(child)}
+            for child in children
+            if child['type'] != 'group'
+        ]
+        for group_subrubrics in await asyncio.gather(
+            *[
+                self._get_subrubrics_from_api(key, region_id, group)
+                for group in groups
+            ]
+        ):
+            subrubrics.extend(group_subrubrics)
+        return subrubrics
+
+    async def _get_rubrics_tree_from_api(self) -> RubricsData:
+        """Отдаёт дерево рубрик из API 2GIS.
+
+        Returns:
+            RubricsData: данные по рубрикам.
+        """
+        key = await self._run_in_driver(self._get_key_api)
+        region_id = await self._get_region_id(key)
+        rubrics = await self._get_rubrics_from_api(key, region_id, '0')
+        data = {}
+        for rubric, subrubrics in zip(
+            rubrics,
+            await asyncio.gather(
+                *[
+                    self._get_subrubrics_from_api(key, region_id, rubric)
+                    for rubric in rubrics
+                ]
+            ),
+        ):
+            data[rubric['name']] = {
+                'url': self._get_url_rubric(rubric),
+                'subrubrics': subrubrics,
+            }
+            self.signal_parse_rubric(rubric['name'], len(subrubrics))
+        return data
+
+    def _get_rubrics_tree_from_pages(self) -> RubricsData:
+        """Отдаёт дерево рубрик со страниц 2GIS.
+
+        Returns:
+            RubricsData: данные по рубрикам.
+        """
+        data = {}
+        for a_rubric in self._get_rubrics():
+            subrubrics = [
+                {'name': a_subrubric[0], 'url': a_subrubric[1]}
+                for a_subrubric in self._get_subrubrics(a_rubric)
+            ]
+            data[a_rubric[0]] = {'url': a_rubric[1], 'subrubrics': subrubrics}
+            self.signal_parse_rubric(a_rubric[0], len(subrubrics))
+        return data
+
+    async def parse_rubrics(self) -> RubricsData:
+        """Парсинг дерева рубрик города.
+
+        Дерево берётся из API 2GIS, при ошибке API рубрики собираются
+        со страниц сайта.
+
+        Returns:
+            RubricsData: данные по рубрикам.
+        """
+        from aiohttp import ClientError
+
+        if self.RUBRICS_FROM_API:
+            try:
+                return await self._get_rubrics_tree_from_api()
+            except (
+                ClientError,
+                asyncio.TimeoutError,
+                ProxiesRejectedException,
+                ValueError,
+                KeyError,
+                TypeError,
+            ):
+                logger.warning(
+                    'Рубрики города "%s" собираются со страниц: ошибка API',
+                    self.SLUG_CITY,
+                    exc_info=True,
+                )
+        return await self._run_in_driver(self._get_rubrics_tree_from_pages)
+
+    async def parse_rubric(
+        self,
+        a_rubric: tuple[str, str],
+        orgs_id: set[str] | None = None,
+        a_subrubrics: list[tuple[str, str]] | None = None,
+    ) -> tuple[dict[str, list[dict[str, str]]], set[str]]:
+        """Парсинг фирм рубрики.
+
+        Подрубрики парсятся одновременно, дубликаты исключаются
+        в порядке следования подрубрик.
+
+        Args:
+            a_rubric (tuple[str, str]): данные по рубрике.
+            orgs_id (set[str] | None): id спаршенных организаций.
+            a_subrubrics (list[tuple[str, str]] | None): данные
+                по подрубрикам. Defaults to None - со страницы рубрики.
+
+        Returns:
+            tuple[dict[str, list[dict[str, str]]], set[str]]:
+             фирмы по подрубрикам и спаршенные организации.
+        """
+        if orgs_id is None:
+            orgs_id = set()
+        if a_subrubrics is None:
+            a_subrubrics = await self._run_in_driver(
+                self._get_subrubrics, a_rubric
+            )
+        semaphore = asyncio.Semaphore(self.COUNT_CONCURRENT_SUBRUBRICS)
+
+        async def get_subrubric_firms(
+            a_subrubric: tuple[str, str],
+        ) -> list[dict[str, str]]:
+            async with semaphore:
+                return await self._get_subrubric_firms(a_subrubric, orgs_id)
+
+        data = {}
+        with self._scope_firms_index():
+            for a_subrubric, firms in zip(
+                a_subrubrics,
+                await asyncio.gather(
+                    *[
+                        get_subrubric_firms(a_subrubric)
+                        for a_subrubric in a_subrubrics
+                    ]
+                ),
+            ):
+                data[a_subrubric[0]] = self._merge_firms(
+                    a_subrubric[0], firms, orgs_id
+                )
+        return data, orgs_id
+
+    async def parse_city(self) -> RubricsData:
         """Полный парсинг фирм с рубриками и подрубриками.
 
         Returns:
             RubricsData: данных по фирмам.
         """
-        a_rubrics = self._get_rubrics()
+        rubrics = await self.parse_rubrics()
         data = {}
         all_orgs_id = set()
-        for a_rubric in a_rubrics:
-            rubric_name = a_rubric[0]
-            data[rubric_name] = {}
-            a_subrubrics = self._get_subrubrics(a_rubric)
-            for a_subrubric in a_subrubrics:
-                firms, orgs_id = self._get_firms(a_subrubric, all_orgs_id)
-                all_orgs_id.union(orgs_id)
-                data[rubric_name][a_subrubric[0]] = firms
+        with self._scope_firms_index():
+            for name, rubric in rubrics.items():
+                data[name], _ = await self.parse_rubric(
+                    (name, rubric['url']),
+                    all_orgs_id,
+                    [
+                        (subrubric['name'], subrubric['url'])
+                        for subrubric in rubric['subrubrics']
+                    ],
+                )
         return data
+
+
+class Parser(AsyncParser):
+    """Парсер фирм в 2gis.
+
+    Синхронная обёртка над AsyncParser с одним долгоживущим
+    циклом событий.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация парсера и цикла событий."""
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+
+    def _run(self, coroutine: Any) -> Any:
+        """Выполняет корутину в цикле событий парсера.
+
+        Args:
+            coroutine (Any): корутина.
+
+        Returns:
+            Any: результат корутины.
+        """
+        return self.loop.run_until_complete(coroutine)
+
+    def close(self) -> None:
+        """Закрывает HTTP-сессию, драйвер и цикл событий парсера."""
+        if self.loop.is_closed():
+            return
+        self._run(self.aclose())
+        super().close()
+        self.loop.close()
+
+    def _get_firms(
+        self,
+        a_subrubric: tuple[str, str],
+        orgs_id: set[str] | None = None,
+    ) -> tuple[list[dict[str, str]], set[str]]:
+        """Отдаёт список данных по фирмам.
+
+        Args:
+            a_subrubric (tuple[str, str]):  данные по подрубрике.
+            orgs_id (set[str] | None):  id спаршенных организаций.
+
+        Returns:
+            tuple[list[dict[str, str]], set[str]]:
+             список данных по фирмам и спаршенные организации.
+        """
+        return self._run(self.parse_subrubric(a_subrubric, orgs_id))
+
+    def parsing_rubrics(self) -> RubricsData:
+        """Парсинг дерева рубрик города.
+
+        Returns:
+            RubricsData: данные по рубрикам.
+        """
+        return self._run(self.parse_rubrics())
+
+    def parsing(self) -> RubricsData:
+        """Полный парсинг фирм с рубриками и подрубриками.
+
+        Returns:
+            RubricsData: данных по фирмам.
+        """
+        return self._run(self.parse_city())
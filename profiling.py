@@ -0,0 +1,229 @@
+from pathlib import Path
+from collections import defaultdict
+import cProfile
+import io
+import pstats
+import tracemalloc
+
+from parser import Parser
+from typings import RubricsData
+
+
+class ProfilingParser(Parser):
+    """Парсер фирм в 2gis с профилированием подрубрик.
+
+    Подрубрики парсятся последовательно, а драйвер работает в потоке
+    цикла событий, чтобы профиль подрубрики учитывал всю её работу.
+    """
+
+    RUN_DRIVER_IN_EXECUTOR = False
+
+    def __init__(self) -> None:
+        """Инициализация драйвера парсера и общей статистики."""
+        super().__init__()
+        self.total_stats: pstats.Stats | None = None
+        self.total_allocations: dict[str, list[int]] = defaultdict(
+            lambda: [0, 0]
+        )
+
+    def _get_profiles_dir(self) -> Path:
+        """Отдаёт директорию профилей города.
+
+        Returns:
+            Path: директория профилей.
+        """
+        profiles_dir = Path('cities', self.SLUG_CITY, self.PROFILES_DIR)
+        profiles_dir.mkdir(parents=True, exist_ok=True)
+        return profiles_dir
+
+    def _get_categories_time(self, stats: pstats.Stats) -> dict[str, float]:
+        """Отдаёт собственное время функций по категориям.
+
+        Args:
+            stats (pstats.Stats): статистика профилировщика.
+
+        Returns:
+            dict[str, float]: время по категориям.
+        """
+        categories = dict.fromkeys(self.CATEGORIES_PROFILE, 0.0)
+        for (file_name, _, _), data in stats.stats.items():
+            for category, pattern in self.CATEGORIES_PROFILE.items():
+                if pattern in file_name:
+                    categories[category] += data[2]
+                    break
+        return categories
+
+    def _get_report(
+        self,
+        title: str,
+        stats: pstats.Stats,
+        allocations: list[tuple[str, int, int]],
+        peak: int | None = None,
+    ) -> str:
+        """Отдаёт текстовый отчёт профилирования.
+
+        Args:
+            title (str): заголовок отчёта.
+            stats (pstats.Stats): статистика профилировщика.
+            allocations (list[tuple[str, int, int]]):
+                место, размер и количество выделений памяти.
+            peak (int | None, optional): пик памяти. Defaults to None.
+
+        Returns:
+            str: отчёт.
+        """
+        lines = [title, '', 'Время по категориям (с):']
+        for category, time in self._get_categories_time(stats).items():
+            lines.append(f'  {category}: {time:.3f}')
+        if peak is not None:
+            lines.extend(('', f'Пик памяти: {peak / 1024:.1f} KiB'))
+        lines.extend(('', 'Топ выделений памяти:'))
+        for trace, size, count in allocations[: self.COUNT_TOP_ALLOCATIONS]:
+            lines.append(f'  {size / 1024:.1f} KiB, {count} блоков: {trace}')
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(self.COUNT_TOP_PROFILE)
+        lines.extend(('', stream.getvalue()))
+        return '\n'.join(lines)
+
+    def _save_profile(
+        self,
+        name: str,
+        stats: pstats.Stats,
+        report: str,
+    ) -> None:
+        """Сохраняет профиль и отчёт.
+
+        Args:
+            name (str): название профиля.
+            stats (pstats.Stats): статистика профилировщика.
+            report (str): текстовый отчёт.
+        """
+        profiles_dir = self._get_profiles_dir()
+        name = name.replace('/', '')
+        stats.dump_stats(profiles_dir / f'{name}.prof')
+        with open(profiles_dir / f'{name}.txt', 'w') as file:
+            file.write(report)
+
+    def _get_firms(
+        self,
+        a_subrubric: tuple[str, str],
+        orgs_id: set[str] | None = None,
+    ) -> tuple[list[dict[str, str]], set[str]]:
+        """Отдаёт список данных по фирмам с профилированием.
+
+        Args:
+            a_subrubric (tuple[str, str]):  данные по подрубрике.
+            orgs_id (set[str] | None):  id спаршенных организаций.
+
+        Returns:
+            tuple[list[dict[str, str]], set[str]]:
+             список данных по фирмам и спаршенные организации.
+        """
+        profiler = cProfile.Profile()
+        tracemalloc.start(self.COUNT_FRAMES_ALLOCATIONS)
+        snapshot_start = tracemalloc.take_snapshot()
+        profiler.enable()
+        try:
+            return super()._get_firms(a_subrubric, orgs_id)
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            filters = (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+            self._save_subrubric_profile(
+                a_subrubric[0],
+                profiler,
+                snapshot.filter_traces(filters).compare_to(
+                    snapshot_start.filter_traces(filters), 'lineno'
+                ),
+                peak,
+            )
+
+    def _save_subrubric_profile(
+        self,
+        name: str,
+        profiler: cProfile.Profile,
+        differences: list[tracemalloc.StatisticDiff],
+        peak: int,
+    ) -> None:
+        """Сохраняет профиль подрубрики и дополняет общую статистику.
+
+        Args:
+            name (str): название подрубрики.
+            profiler (cProfile.Profile): профилировщик подрубрики.
+            differences (list[tracemalloc.StatisticDiff]):
+                прирост памяти по строкам кода.
+            peak (int): пик памяти.
+        """
+        stats = pstats.Stats(profiler)
+        if self.total_stats is None:
+            self.total_stats = pstats.Stats(profiler)
+        else:
+            self.total_stats.add(profiler)
+        allocations = []
+        for difference in differences:
+            if difference.size_diff <= 0:
+                continue
+            trace = str(difference.traceback)
+            allocations.append(
+                (trace, difference.size_diff, difference.count_diff)
+            )
+            self.total_allocations[trace][0] += difference.size_diff
+            self.total_allocations[trace][1] += difference.count_diff
+        allocations.sort(key=lambda allocation: allocation[1], reverse=True)
+        self._save_profile(
+            name,
+            stats,
+            self._get_report(f'Подрубрика "{name}"', stats, allocations, peak),
+        )
+
+    def _save_total_profile(self) -> None:
+        """Сохраняет общий профиль по всем подрубрикам."""
+        if self.total_stats is None:
+            return
+        allocations = sorted(
+            (
+                (trace, size, count)
+                for trace, (size, count) in self.total_allocations.items()
+            ),
+            key=lambda allocation: allocation[1],
+            reverse=True,
+        )
+        self._save_profile(
+            self.NAME_TOTAL_PROFILE,
+            self.total_stats,
+            self._get_report(
+                f'Город "{self.SLUG_CITY}"', self.total_stats, allocations
+            ),
+        )
+
+    def parsing(self) -> RubricsData:
+        """Полный парсинг фирм с сохранением общего профиля.
+
+        Дерево рубрик собирается как в Parser.parsing, подрубрики
+        парсятся последовательно, чтобы профили не смешивались.
+
+        Returns:
+            RubricsData: данных по фирмам.
+        """
+        try:
+            rubrics = self.parsing_rubrics()
+            data = {}
+            all_orgs_id = set()
+            with self._scope_firms_index():
+                for name, rubric in rubrics.items():
+                    data[name] = {}
+                    for subrubric in rubric['subrubrics']:
+                        firms, _ = self._get_firms(
+                            (subrubric['name'], subrubric['url']),
+                            all_orgs_id,
+                        )
+                        data[name][subrubric['name']] = firms
+            return data
+        finally:
+            self._save_total_profile()
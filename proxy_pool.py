@@ -0,0 +1,224 @@
+from pathlib import Path
+from threading import Lock
+from urllib.parse import urlparse
+import asyncio
+import logging
+import time
+
+from settings import ParserSettings
+
+logger = logging.getLogger(__name__)
+
+
+class Proxy:
+    """Состояние прокси."""
+
+    def __init__(self, url: str, budget: float) -> None:
+        """Инициализация прокси.
+
+        Args:
+            url (str): URL прокси.
+            budget (float): начальный запас запросов.
+        """
+        self.url = url
+        self.tokens = budget
+        self.time_refill = time.monotonic()
+        self.in_flight = 0
+        self.count_drivers = 0
+        self.count_errors = 0
+        self.count_quarantines = 0
+        self.quarantined_until = 0.0
+        self.latency = 0.0
+
+    @property
+    def has_auth(self) -> bool:
+        """Проверяет наличие данных авторизации в адресе прокси.
+
+        Returns:
+            bool: True - прокси с авторизацией.
+        """
+        return urlparse(self.url).username is not None
+
+    @property
+    def url_driver(self) -> str:
+        """Отдаёт адрес прокси для Chrome без данных авторизации.
+
+        Returns:
+            str: адрес прокси.
+        """
+        url = urlparse(self.url)
+        port = f':{url.port}' if url.port else ''
+        return f'{url.scheme}://{url.hostname}{port}'
+
+
+class ProxyPool(ParserSettings):
+    """Пул прокси для запросов к API и драйверов Chrome.
+
+    У каждого прокси свой бюджет запросов (RATE_PROXY в секунду,
+    не больше BURST_PROXY подряд). Запрос получает наименее
+    загруженный прокси с меньшим кол-вом ошибок подряд и лучшей
+    задержкой, поэтому повтор запроса уходит на другой прокси.
+    После MAX_ERRORS_PROXY ошибок подряд прокси уходит в карантин.
+    Без прокси запросы идут напрямую. Chrome не принимает авторизацию
+    в --proxy-server, поэтому прокси с авторизацией не выдаются
+    драйверам.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пула."""
+        self.lock = Lock()
+        self.proxies: list[Proxy] = []
+
+    def load(self, path: Path | None = None) -> None:
+        """Загружает прокси из файла, по одному URL на строку.
+
+        Args:
+            path (Path | None, optional): путь к файлу.
+                Defaults to None - PROXIES_PATH.
+        """
+        try:
+            with open(path or self.PROXIES_PATH, 'r') as file:
+                urls = [line.strip() for line in file]
+        except OSError:
+            urls = []
+        self.proxies = [
+            Proxy(url, self.BURST_PROXY)
+            for url in urls
+            if url and not url.startswith('#')
+        ]
+        count_auth = sum(proxy.has_auth for proxy in self.proxies)
+        if count_auth:
+            logger.warning(
+                'Прокси с авторизацией (%d) используются только для API, '
+                'драйверы Chrome их не используют',
+                count_auth,
+            )
+
+    def _refill(self, proxy: Proxy, now: float) -> None:
+        """Пополняет бюджет запросов прокси.
+
+        Args:
+            proxy (Proxy): прокси.
+            now (float): текущее время.
+        """
+        proxy.tokens = min(
+            proxy.tokens + (now - proxy.time_refill) * self.RATE_PROXY,
+            self.BURST_PROXY,
+        )
+        proxy.time_refill = now
+
+    def _get_wait(self, proxy: Proxy, now: float) -> float:
+        """Отдаёт время до доступности прокси.
+
+        Args:
+            proxy (Proxy): прокси.
+            now (float): текущее время.
+
+        Returns:
+            float: время в секундах.
+        """
+        if proxy.quarantined_until > now:
+            return proxy.quarantined_until - now
+        return max((1 - proxy.tokens) / self.RATE_PROXY, 0)
+
+    async def acquire(self) -> Proxy | None:
+        """Выдаёт прокси для запроса, дожидаясь бюджета.
+
+        Returns:
+            Proxy | None: прокси, None - запрос идёт напрямую.
+        """
+        if not self.proxies:
+            return None
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                for proxy in self.proxies:
+                    self._refill(proxy, now)
+                available = [
+                    proxy
+                    for proxy in self.proxies
+                    if proxy.quarantined_until <= now and proxy.tokens >= 1
+                ]
+                if available:
+                    proxy = min(
+                        available,
+                        key=lambda proxy: (
+                            proxy.in_flight,
+                            proxy.count_errors,
+                            proxy.latency,
+                        ),
+                    )
+                    proxy.tokens -= 1
+                    proxy.in_flight += 1
+                    return proxy
+                wait = min(
+                    self._get_wait(proxy, now) for proxy in self.proxies
+                )
+            await asyncio.sleep(wait)
+
+    def release(
+        self,
+        proxy: Proxy | None,
+        latency: float | None = None,
+    ) -> None:
+        """Возвращает прокси после запроса.
+
+        Args:
+            proxy (Proxy | None): прокси.
+            latency (float | None, optional): задержка запроса.
+                Defaults to None - запрос завершился ошибкой.
+        """
+        if proxy is None:
+            return
+        with self.lock:
+            proxy.in_flight -= 1
+            if latency is not None:
+                proxy.count_errors = 0
+                proxy.count_quarantines = 0
+                proxy.latency += self.WEIGHT_LATENCY * (
+                    latency - proxy.latency
+                )
+                return
+            proxy.count_errors += 1
+            if proxy.count_errors < self.MAX_ERRORS_PROXY:
+                return
+            proxy.quarantined_until = time.monotonic() + (
+                self.QUARANTINE_PROXY * 2**proxy.count_quarantines
+            )
+            proxy.count_quarantines += 1
+            proxy.count_errors = 0
+
+    def acquire_driver(self) -> Proxy | None:
+        """Выдаёт исправный прокси с наименьшим кол-вом драйверов.
+
+        Прокси с авторизацией пропускаются.
+
+        Returns:
+            Proxy | None: прокси, None - драйвер работает напрямую.
+        """
+        with self.lock:
+            now = time.monotonic()
+            proxies = [
+                proxy
+                for proxy in self.proxies
+                if proxy.quarantined_until <= now and not proxy.has_auth
+            ]
+            if not proxies:
+                return None
+            proxy = min(proxies, key=lambda proxy: proxy.count_drivers)
+            proxy.count_drivers += 1
+            return proxy
+
+    def release_driver(self, proxy: Proxy | None) -> None:
+        """Освобождает прокси закрытого драйвера.
+
+        Args:
+            proxy (Proxy | None): прокси.
+        """
+        if proxy is None:
+            return
+        with self.lock:
+            proxy.count_drivers -= 1
+
+
+proxy_pool = ProxyPool()
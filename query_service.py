@@ -0,0 +1,321 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import urlparse, parse_qs
+import json
+import re
+import sqlite3
+
+from settings import QuerySettings
+from writer import read_json
+
+
+class FirmsStore(QuerySettings):
+    """Индексированное хранилище спаршенных фирм.
+
+    Фирмы из JSON-файлов `cities/<slug>/` переносятся в SQLite
+    с полнотекстовым поиском по названию и адресу и индексами
+    по id организации, телефону и рубрикам.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS firms (
+            id INTEGER PRIMARY KEY,
+            city TEXT NOT NULL,
+            rubric TEXT,
+            subrubric TEXT NOT NULL,
+            org_id TEXT,
+            name TEXT,
+            phone TEXT,
+            phone_digits TEXT,
+            address TEXT,
+            email TEXT,
+            image_href TEXT,
+            site TEXT,
+            work_schedule TEXT
+        );
+        CREATE INDEX IF NOT EXISTS firms_org_id ON firms (org_id);
+        CREATE INDEX IF NOT EXISTS firms_phone ON firms (phone_digits);
+        CREATE INDEX IF NOT EXISTS firms_rubric
+            ON firms (city, rubric, subrubric);
+        CREATE VIRTUAL TABLE IF NOT EXISTS firms_fts USING fts5(
+            name,
+            address,
+            content='firms',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Инициализация хранилища.
+
+        Args:
+            path (Path | None, optional): путь к базе.
+                Defaults to None - STORE_PATH.
+        """
+        self.path = Path(path or self.STORE_PATH)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с базой.
+
+        Returns:
+            sqlite3.Connection: соединение.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        connection.executescript(self.SCHEMA)
+        return connection
+
+    @staticmethod
+    def _get_phone_digits(phone: str | None) -> str:
+        """Отдаёт последние 10 цифр телефона.
+
+        Args:
+            phone (str | None): телефон.
+
+        Returns:
+            str: цифры телефона.
+        """
+        return re.sub(r'\D', '', phone or '')[-10:]
+
+    def _get_rubrics_subrubrics(self, city_dir: Path) -> dict[str, str]:
+        """Отдаёт рубрики подрубрик города.
+
+        Args:
+            city_dir (Path): папка города.
+
+        Returns:
+            dict[str, str]: рубрика по имени файла подрубрики.
+        """
+        try:
+            rubrics = read_json(city_dir / self.NAME_RUBRICS_FILE)
+        except (OSError, json.decoder.JSONDecodeError):
+            return {}
+        return {
+            subrubric['name'].replace('/', ''): name
+            for name, rubric in rubrics.items()
+            for subrubric in rubric.get('subrubrics', [])
+        }
+
+    def _get_rows(
+        self,
+        slug_city: str,
+    ) -> Iterator[tuple[Any, ...]]:
+        """Отдаёт строки фирм из JSON-файлов города.
+
+        Args:
+            slug_city (str): slug города.
+
+        Yields:
+            Iterator[tuple[Any, ...]]: строки таблицы фирм.
+        """
+        city_dir = Path(self.CITIES_DIR, slug_city)
+        rubrics = self._get_rubrics_subrubrics(city_dir)
+        for path in sorted(
+            [*city_dir.glob('*.json'), *city_dir.glob('*.json.gz')]
+        ):
+            name_subrubric = path.name.removesuffix('.gz')[: -len('.json')]
+            try:
+                data = read_json(path)
+            except (OSError, json.decoder.JSONDecodeError):
+                continue
+            if not isinstance(data, dict) or not isinstance(
+                data.get('firms'), list
+            ):
+                continue
+            for firm in data['firms']:
+                yield (
+                    slug_city,
+                    rubrics.get(name_subrubric),
+                    name_subrubric,
+                    *[
+                        firm.get(field)
+                        for field in self.FIELDS_FIRM
+                        if field != 'work_schedule'
+                    ],
+                    self._get_phone_digits(firm.get('phone')),
+                    json.dumps(firm.get('work_schedule')),
+                )
+
+    def index_city(self, slug_city: str) -> int:
+        """Переиндексирует фирмы города.
+
+        Args:
+            slug_city (str): slug города.
+
+        Returns:
+            int: кол-во проиндексированных фирм.
+        """
+        fields = [
+            field for field in self.FIELDS_FIRM if field != 'work_schedule'
+        ]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'INSERT INTO firms_fts(firms_fts, rowid, name, address) '
+                    "SELECT 'delete', id, name, address FROM firms "
+                    'WHERE city = ?',
+                    (slug_city,),
+                )
+                connection.execute(
+                    'DELETE FROM firms WHERE city = ?', (slug_city,)
+                )
+                connection.executemany(
+                    'INSERT INTO firms (city, rubric, subrubric, '
+                    f'{', '.join(fields)}, phone_digits, work_schedule) '
+                    f'VALUES ({', '.join('?' * (len(fields) + 5))})',
+                    self._get_rows(slug_city),
+                )
+                connection.execute(
+                    'INSERT INTO firms_fts(rowid, name, address) '
+                    'SELECT id, name, address FROM firms WHERE city = ?',
+                    (slug_city,),
+                )
+                return connection.execute(
+                    'SELECT COUNT(*) FROM firms WHERE city = ?',
+                    (slug_city,),
+                ).fetchone()[0]
+        finally:
+            connection.close()
+
+    def query(
+        self,
+        text: str | None = None,
+        phone: str | None = None,
+        org_id: str | None = None,
+        city: str | None = None,
+        rubric: str | None = None,
+        subrubric: str | None = None,
+        required: tuple[str, ...] = (),
+        page: int = 1,
+        size_page: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Отдаёт фирмы по фильтрам постранично.
+
+        Args:
+            text (str | None): поиск по названию и адресу.
+            phone (str | None): телефон.
+            org_id (str | None): id организации.
+            city (str | None): slug города.
+            rubric (str | None): рубрика.
+            subrubric (str | None): подрубрика.
+            required (tuple[str, ...]): обязательные непустые поля.
+            page (int): страница.
+            size_page (int | None): размер страницы.
+                Defaults to None - SIZE_PAGE.
+
+        Raises:
+            ValueError: недопустимые параметры запроса.
+
+        Yields:
+            Iterator[dict[str, Any]]: данные по фирмам.
+        """
+        size_page = size_page or self.SIZE_PAGE
+        if page < 1 or not 0 < size_page <= self.MAX_SIZE_PAGE:
+            raise ValueError('Недопустимая страница.')
+        conditions = []
+        params = []
+        if text and (tokens := re.findall(r'\w+', text)):
+            conditions.append(
+                'id IN (SELECT rowid FROM firms_fts WHERE firms_fts MATCH ?)'
+            )
+            params.append(' '.join(f'"{token}"*' for token in tokens))
+        if phone:
+            conditions.append('phone_digits = ?')
+            params.append(self._get_phone_digits(phone))
+        for column, value in (
+            ('org_id', org_id),
+            ('city', city),
+            ('rubric', rubric),
+            ('subrubric', subrubric),
+        ):
+            if value:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        for field in required:
+            if field not in self.FIELDS_REQUIRED:
+                raise ValueError(f'Недопустимое поле "{field}".')
+            conditions.append(f"COALESCE({field}, '') != ''")
+        where = f'WHERE {' AND '.join(conditions)}' if conditions else ''
+        connection = self._connect()
+        try:
+            cursor = connection.execute(
+                'SELECT city, rubric, subrubric, '
+                f'{', '.join(self.FIELDS_FIRM)} FROM firms {where} '
+                'ORDER BY id LIMIT ? OFFSET ?',
+                (*params, size_page, (page - 1) * size_page),
+            )
+            for row in cursor:
+                firm = dict(row)
+                firm['work_schedule'] = json.loads(firm['work_schedule'])
+                yield firm
+        finally:
+            connection.close()
+
+
+class FirmsRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик HTTP-запросов к хранилищу фирм.
+
+    `GET /firms?q=&phone=&org_id=&city=&rubric=&subrubric=&required=
+    &page=&size=` отдаёт фирмы в формате NDJSON по мере чтения из базы.
+    """
+
+    store = FirmsStore()
+
+    def do_GET(self) -> None:
+        """Обработка GET-запроса."""
+        url = urlparse(self.path)
+        if url.path != self.store.PATH_FIRMS:
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+
+        def get_param(name: str) -> str | None:
+            return query.get(name, [None])[0]
+
+        try:
+            firms = self.store.query(
+                text=get_param('q'),
+                phone=get_param('phone'),
+                org_id=get_param('org_id'),
+                city=get_param('city'),
+                rubric=get_param('rubric'),
+                subrubric=get_param('subrubric'),
+                required=tuple(query.get('required', [])),
+                page=int(get_param('page') or 1),
+                size_page=int(get_param('size') or self.store.SIZE_PAGE),
+            )
+            first_firm = next(firms, None)
+        except (ValueError, sqlite3.OperationalError) as error:
+            self.send_error(400, explain=str(error))
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.end_headers()
+        if first_firm is None:
+            return
+        for firm in chain((first_firm,), firms):
+            self.wfile.write(
+                f'{json.dumps(firm, ensure_ascii=False)}\n'.encode()
+            )
+
+
+def serve(host: str | None = None, port: int | None = None) -> None:
+    """Запускает HTTP-сервис запросов к фирмам.
+
+    Args:
+        host (str | None, optional): хост. Defaults to None - HOST.
+        port (int | None, optional): порт. Defaults to None - PORT.
+    """
+    server = ThreadingHTTPServer(
+        (host or QuerySettings.HOST, port or QuerySettings.PORT),
+        FirmsRequestHandler,
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
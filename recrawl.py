@@ -0,0 +1,273 @@
+from pathlib import Path
+from typing import Any
+import copy
+import json
+import logging
+import math
+import time
+
+from exceptions import NoCityOn2GISException
+from parser import Parser
+from settings import RecrawlSettings
+from typings import RubricsData
+from upload_manifest import get_diff, get_manifest
+from writer import read_json, result_writer
+
+logger = logging.getLogger(__name__)
+
+
+class RecrawlScheduler(RecrawlSettings):
+    """Планировщик повторного парсинга подрубрик города.
+
+    Для каждой подрубрики хранится время последнего парсинга,
+    наблюдаемая скорость изменений и стоимость парсинга в запросах.
+    Приоритет подрубрики - вероятность изменений с последнего парсинга
+    на один запрос. Подрубрики парсятся по приоритету, пока хватает
+    глобального бюджета BUDGET_REQUESTS запросов за PERIOD_BUDGET.
+    Состояние сохраняется после каждого парсинга.
+    """
+
+    def __init__(self, parser: Parser) -> None:
+        """Инициализация планировщика.
+
+        Args:
+            parser (Parser): парсер города.
+        """
+        self.parser = parser
+        self.state = self._load_state()
+
+    def _get_path_state(self) -> Path:
+        """Отдаёт путь к состоянию планировщика города.
+
+        Returns:
+            Path: путь к файлу.
+        """
+        return Path(self.STATE_DIR, f'{self.parser.SLUG_CITY}.json')
+
+    def _load_state(self) -> dict[str, Any]:
+        """Отдаёт сохранённое состояние планировщика.
+
+        Returns:
+            dict[str, Any]: состояние, новое при отсутствии.
+        """
+        state = {
+            'budget': self.BUDGET_REQUESTS,
+            'time_budget': time.time(),
+            'time_rubrics': None,
+            'subrubrics': {},
+        }
+        try:
+            saved_state = read_json(self._get_path_state())
+        except (OSError, json.decoder.JSONDecodeError):
+            return state
+        if isinstance(saved_state, dict):
+            state.update(saved_state)
+        return state
+
+    def _save_state(self) -> None:
+        """Ставит копию состояния планировщика в очередь записи."""
+        result_writer.write(self._get_path_state(), copy.deepcopy(self.state))
+
+    def _save_data(self, name_file: str, data: Any) -> None:
+        """Ставит данные города в очередь записи.
+
+        Args:
+            name_file (str): название файла.
+            data (Any): данные для сохранения.
+        """
+        result_writer.write(self.parser._get_path_data(name_file), data)
+
+    def _get_cost(self) -> int:
+        """Отдаёт кол-во запросов и переходов парсера.
+
+        Returns:
+            int: кол-во запросов.
+        """
+        return self.parser.count_requests + self.parser.count_navigations
+
+    def _refill_budget(self, now: float) -> None:
+        """Пополняет бюджет запросов.
+
+        Args:
+            now (float): текущее время.
+        """
+        self.state['budget'] = min(
+            self.state['budget']
+            + (now - self.state['time_budget'])
+            * self.BUDGET_REQUESTS
+            / self.PERIOD_BUDGET,
+            self.BUDGET_REQUESTS,
+        )
+        self.state['time_budget'] = now
+
+    def _update_subrubrics(self, rubrics: RubricsData) -> None:
+        """Обновляет подрубрики состояния по дереву рубрик.
+
+        Args:
+            rubrics (RubricsData): данные по рубрикам.
+        """
+        subrubrics = {}
+        for name_rubric, rubric in rubrics.items():
+            for subrubric in rubric['subrubrics']:
+                subrubrics[subrubric['name']] = {
+                    'change_rate': self.START_CHANGE_RATE,
+                    'cost': self.START_COST_RECRAWL,
+                    'time_parsing': None,
+                    **self.state['subrubrics'].get(subrubric['name'], {}),
+                    'rubric': name_rubric,
+                    'url': subrubric['url'],
+                }
+        self.state['subrubrics'] = subrubrics
+
+    def _refresh_rubrics(self, now: float) -> None:
+        """Обновляет дерево рубрик города раз в TTL_RUBRICS.
+
+        Args:
+            now (float): текущее время.
+        """
+        time_rubrics = self.state['time_rubrics']
+        if time_rubrics is not None and now - time_rubrics < self.TTL_RUBRICS:
+            return
+        cost = self._get_cost()
+        rubrics = self.parser.parsing_rubrics()
+        self.state['budget'] -= self._get_cost() - cost
+        self._save_data(self.NAME_RUBRICS_FILE, rubrics)
+        self._update_subrubrics(rubrics)
+        self.state['time_rubrics'] = now
+        self._save_state()
+
+    def _get_priority(
+        self,
+        subrubric: dict[str, Any],
+        now: float,
+    ) -> float | None:
+        """Отдаёт приоритет повторного парсинга подрубрики.
+
+        Args:
+            subrubric (dict[str, Any]): состояние подрубрики.
+            now (float): текущее время.
+
+        Returns:
+            float | None: приоритет, None - парсинг не нужен.
+        """
+        if now - subrubric.get('time_error', -math.inf) < (
+            self.MIN_INTERVAL_RECRAWL
+        ):
+            return None
+        if subrubric['time_parsing'] is None:
+            return math.inf
+        staleness = now - subrubric['time_parsing']
+        if staleness < self.MIN_INTERVAL_RECRAWL:
+            return None
+        if staleness >= self.MAX_INTERVAL_RECRAWL:
+            return math.inf
+        probability = 1 - math.exp(-subrubric['change_rate'] * staleness)
+        return probability / max(subrubric['cost'], 1)
+
+    def _get_next_subrubric(self, now: float) -> str | None:
+        """Отдаёт подрубрику с наибольшим приоритетом.
+
+        Args:
+            now (float): текущее время.
+
+        Returns:
+            str | None: название подрубрики, None - парсинг не нужен.
+        """
+        priorities = {}
+        for name, subrubric in self.state['subrubrics'].items():
+            priority = self._get_priority(subrubric, now)
+            if priority is not None:
+                priorities[name] = priority
+        return max(priorities, key=priorities.get, default=None)
+
+    def _parse_subrubric(self, name: str, now: float) -> None:
+        """Парсит подрубрику и обновляет её статистику.
+
+        Каждый парсинг начинается с пустыми индексом дубликатов
+        и набором спаршенных организаций, иначе фирмы прошлых
+        парсингов отбрасывались бы как дубликаты.
+
+        Args:
+            name (str): название подрубрики.
+            now (float): текущее время.
+        """
+        subrubric = self.state['subrubrics'][name]
+        cost = self._get_cost()
+        firms, _ = self.parser._get_firms((name, subrubric['url']))
+        cost = self._get_cost() - cost
+        self.state['budget'] -= cost
+        old_firms = self.parser._load_firms(name) or []
+        if subrubric['time_parsing'] is None:
+            subrubric['cost'] = cost
+        else:
+            changed_firms, deleted_keys = get_diff(
+                firms, get_manifest(old_firms)
+            )
+            share_changes = (len(changed_firms) + len(deleted_keys)) / max(
+                len(firms), len(old_firms), 1
+            )
+            change_rate = share_changes / max(
+                now - subrubric['time_parsing'], 1
+            )
+            subrubric['change_rate'] += self.WEIGHT_RECRAWL * (
+                change_rate - subrubric['change_rate']
+            )
+            subrubric['cost'] += self.WEIGHT_RECRAWL * (
+                cost - subrubric['cost']
+            )
+        subrubric['time_parsing'] = now
+        self._save_data(name, self.parser._get_subrubric_data(name, firms))
+        self._save_state()
+
+    def run_once(self) -> str | None:
+        """Парсит одну подрубрику, если она нужна и хватает бюджета.
+
+        Подрубрика с ошибкой парсинга откладывается
+        на MIN_INTERVAL_RECRAWL.
+
+        Returns:
+            str | None: название спаршенной подрубрики.
+        """
+        now = time.time()
+        self._refresh_rubrics(now)
+        self._refill_budget(now)
+        name = self._get_next_subrubric(now)
+        if name is None:
+            return None
+        cost = min(
+            self.state['subrubrics'][name]['cost'], self.BUDGET_REQUESTS
+        )
+        if self.state['budget'] < cost:
+            return None
+        try:
+            self._parse_subrubric(name, now)
+        except NoCityOn2GISException:
+            raise
+        except Exception:
+            self.state['subrubrics'][name]['time_error'] = now
+            self._save_state()
+            raise
+        return name
+
+    def run(self) -> None:
+        """Запускает планировщик до остановки процесса.
+
+        Ошибки парсинга подрубрики не останавливают планировщик,
+        отсутствие города - останавливает.
+        """
+        while True:
+            try:
+                name = self.run_once()
+            except NoCityOn2GISException:
+                raise
+            except Exception:
+                logger.exception('Ошибка планировщика')
+                name = None
+            if name is None:
+                time.sleep(self.INTERVAL_DAEMON)
+                continue
+            logger.info(
+                'Подрубрика "%s" спаршена, бюджет: %.0f',
+                name,
+                self.state['budget'],
+            )
@@ -0,0 +1,287 @@
+from collections import defaultdict, deque
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable
+import asyncio
+import gzip
+import json
+import time
+
+from exceptions import NoCityOn2GISException, NoRecordReplayException
+from parser import Parser
+
+
+class ArchiveMixin:
+    """Общее поведение записи и воспроизведения парсинга.
+
+    meta данные города хранятся только в памяти, чтобы решения
+    о переходах браузера при записи и воспроизведении совпадали.
+    """
+
+    def _load_meta_city(self) -> dict[str, Any] | None:
+        """Отдаёт meta данные города из памяти.
+
+        Returns:
+            dict[str, Any] | None: ключ API и область поиска города.
+        """
+        return self.meta_city
+
+    def _save_meta_city(self, meta_data: dict[str, Any]) -> None:
+        """Сохраняет meta данные города в памяти.
+
+        Args:
+            meta_data (dict[str, Any]): meta данные подрубрики.
+        """
+        self.meta_city = {key: meta_data[key] for key in self.KEYS_META_CITY}
+
+    def _reset_meta_city(self) -> None:
+        """Сбрасывает meta данные города."""
+        self.meta_city = None
+
+    @staticmethod
+    def _get_key(*args: Any) -> str:
+        """Отдаёт ключ записи по аргументам вызова.
+
+        Args:
+            *args (Any): аргументы вызова.
+
+        Returns:
+            str: ключ записи.
+        """
+        return json.dumps(args, ensure_ascii=False)
+
+
+class RecordingMixin(ArchiveMixin):
+    """Запись переходов браузера и ответов API в архив gzip JSONL."""
+
+    def __init__(self, path: Path) -> None:
+        """Инициализация парсера и архива.
+
+        Args:
+            path (Path): путь к архиву.
+        """
+        super().__init__()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.archive = gzip.open(path, 'wt', encoding='utf-8')
+        self.lock_archive = Lock()
+
+    def _record(
+        self,
+        kind: str,
+        key: str,
+        result: Any,
+        duration: float,
+        error: str | None = None,
+    ) -> None:
+        """Записывает результат вызова в архив.
+
+        Args:
+            kind (str): вид вызова.
+            key (str): ключ записи.
+            result (Any): результат вызова.
+            duration (float): длительность вызова.
+            error (str | None, optional): сообщение исключения
+                отсутствия города. Defaults to None.
+        """
+        line = json.dumps(
+            {
+                'kind': kind,
+                'key': key,
+                'result': result,
+                'duration': duration,
+                'error': error,
+            },
+            ensure_ascii=False,
+        )
+        with self.lock_archive:
+            self.archive.write(f'{line}\n')
+
+    def _call_recorded(self, kind: str, func: Callable, *args: Any) -> Any:
+        """Выполняет работу с драйвером и записывает результат.
+
+        Args:
+            kind (str): вид вызова.
+            func (Callable): функция работы с драйвером.
+            *args (Any): аргументы функции.
+
+        Returns:
+            Any: результат функции.
+        """
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except NoCityOn2GISException as error:
+            self._record(
+                kind,
+                self._get_key(*args),
+                None,
+                time.perf_counter() - start,
+                str(error),
+            )
+            raise
+        self._record(
+            kind, self._get_key(*args), result, time.perf_counter() - start
+        )
+        return result
+
+    def _get_rubrics(self) -> list[tuple[str, str]]:
+        """Отдаёт и записывает список данных по рубрикам."""
+        return self._call_recorded('rubrics', super()._get_rubrics)
+
+    def _get_key_api(self) -> str:
+        """Отдаёт и записывает ключ API 2GIS."""
+        return self._call_recorded('key_api', super()._get_key_api)
+
+    def _get_subrubrics(
+        self,
+        a_rubric: tuple[str, str],
+        is_subrubric_subrubric: bool = False,
+    ) -> list[tuple[str, str]]:
+        """Отдаёт и записывает список данных по подрубрикам."""
+        return self._call_recorded(
+            'subrubrics',
+            super()._get_subrubrics,
+            a_rubric,
+            is_subrubric_subrubric,
+        )
+
+    def _get_subrubric_meta_data(self, url: str) -> dict[str, Any]:
+        """Отдаёт и записывает meta данные подрубрики."""
+        return self._call_recorded(
+            'meta_data', super()._get_subrubric_meta_data, url
+        )
+
+    async def _get_body_from_api(self, url: str) -> bytes:
+        """Отдаёт и записывает тело ответа API 2GIS.
+
+        Тело записывается текстом, чтобы запись не зависела
+        от режима разбора ответов DECODE_FIRMS.
+        """
+        start = time.perf_counter()
+        body = await super()._get_body_from_api(url)
+        self._record(
+            'api',
+            url,
+            body.decode(errors='replace'),
+            time.perf_counter() - start,
+        )
+        return body
+
+    def close(self) -> None:
+        """Закрывает парсер и архив."""
+        super().close()
+        with self.lock_archive:
+            if not self.archive.closed:
+                self.archive.close()
+
+
+class ReplayMixin(ArchiveMixin):
+    """Воспроизведение парсинга из архива без сети и Chrome."""
+
+    RUN_DRIVER_IN_EXECUTOR = False
+
+    def __init__(self, path: Path, is_timing: bool = False) -> None:
+        """Инициализация парсера и загрузка архива.
+
+        Args:
+            path (Path): путь к архиву.
+            is_timing (bool, optional): флаг воспроизведения
+                с записанными задержками. Defaults to False.
+        """
+        super().__init__()
+        self.is_timing = is_timing
+        self.records: defaultdict[tuple[str, str], deque[dict[str, Any]]] = (
+            defaultdict(deque)
+        )
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                record = json.loads(line)
+                self.records[(record['kind'], record['key'])].append(record)
+
+    def _get_record(self, kind: str, key: str) -> dict[str, Any]:
+        """Отдаёт запись архива.
+
+        Повторные вызовы с тем же ключом получают записи по порядку,
+        после исчерпания - последнюю запись.
+
+        Args:
+            kind (str): вид вызова.
+            key (str): ключ записи.
+
+        Raises:
+            NoRecordReplayException: записи нет в архиве.
+
+        Returns:
+            dict[str, Any]: запись.
+        """
+        records = self.records.get((kind, key))
+        if not records:
+            raise NoRecordReplayException(f'Нет записи {kind}: {key}')
+        return records.popleft() if len(records) > 1 else records[0]
+
+    def _call_replayed(self, kind: str, *args: Any) -> Any:
+        """Воспроизводит работу с драйвером.
+
+        Args:
+            kind (str): вид вызова.
+            *args (Any): аргументы вызова.
+
+        Raises:
+            NoCityOn2GISException: город отсутствовал при записи.
+
+        Returns:
+            Any: записанный результат.
+        """
+        record = self._get_record(kind, self._get_key(*args))
+        if self.is_timing:
+            time.sleep(record['duration'])
+        if record['error'] is not None:
+            raise NoCityOn2GISException(record['error'])
+        return record['result']
+
+    def _get_rubrics(self) -> list[tuple[str, str]]:
+        """Отдаёт записанный список данных по рубрикам."""
+        return [tuple(a_rubric) for a_rubric in self._call_replayed('rubrics')]
+
+    def _get_key_api(self) -> str:
+        """Отдаёт записанный ключ API 2GIS."""
+        return self._call_replayed('key_api')
+
+    def _get_subrubrics(
+        self,
+        a_rubric: tuple[str, str],
+        is_subrubric_subrubric: bool = False,
+    ) -> list[tuple[str, str]]:
+        """Отдаёт записанный список данных по подрубрикам."""
+        return [
+            tuple(a_subrubric)
+            for a_subrubric in self._call_replayed(
+                'subrubrics', a_rubric, is_subrubric_subrubric
+            )
+        ]
+
+    def _get_subrubric_meta_data(self, url: str) -> dict[str, Any]:
+        """Отдаёт записанные meta данные подрубрики."""
+        meta_data = self._call_replayed('meta_data', url)
+        if self.CACHE_META_CITY:
+            self._save_meta_city(meta_data)
+        meta_data['pages'] = {
+            int(page): result
+            for page, result in meta_data.get('pages', {}).items()
+        }
+        return meta_data
+
+    async def _get_body_from_api(self, url: str) -> bytes:
+        """Отдаёт записанное тело ответа API 2GIS."""
+        record = self._get_record('api', url)
+        if self.is_timing:
+            await asyncio.sleep(record['duration'])
+        return record['result'].encode()
+
+
+class RecordingParser(RecordingMixin, Parser):
+    """Парсер с записью переходов браузера и ответов API."""
+
+
+class ReplayParser(ReplayMixin, Parser):
+    """Парсер, воспроизводящий записанный парсинг."""
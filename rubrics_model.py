@@ -0,0 +1,258 @@
+from typing import Any
+import re
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from settings import GUISettings
+from typings import RubricsData
+
+
+class RubricItem:
+    """Рубрика или подрубрика списка."""
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        is_rubric: bool,
+        number: int,
+        subrubrics: list[dict[str, str]] | None = None,
+        parent: 'RubricItem | None' = None,
+    ) -> None:
+        """Инициализация рубрики.
+
+        Args:
+            name (str): название.
+            url (str): URL рубрики.
+            is_rubric (bool): флаг рубрики.
+            number (int): номер среди рубрик или подрубрик рубрики.
+            subrubrics (list[dict[str, str]] | None, optional):
+                подрубрики рубрики. Defaults to None.
+            parent (RubricItem | None, optional):
+                родительская рубрика. Defaults to None.
+        """
+        self.name = name
+        self.url = url
+        self.is_rubric = is_rubric
+        self.number = number
+        self.subrubrics = subrubrics or []
+        self.parent = parent
+        self.children: list[RubricItem | None] = [None] * len(self.subrubrics)
+
+    def get_child(self, number: int) -> 'RubricItem':
+        """Отдаёт подрубрику, создавая её при первом обращении.
+
+        Args:
+            number (int): номер подрубрики.
+
+        Returns:
+            RubricItem: подрубрика.
+        """
+        child = self.children[number]
+        if child is None:
+            subrubric = self.subrubrics[number]
+            child = RubricItem(
+                subrubric['name'], subrubric['url'], False, number, parent=self
+            )
+            self.children[number] = child
+        return child
+
+
+class RubricsIndex(GUISettings):
+    """Индекс поиска рубрик по префиксам слов."""
+
+    def __init__(self, names: list[str]) -> None:
+        """Построение индекса.
+
+        Args:
+            names (list[str]): названия.
+        """
+        self.tokens: list[list[str]] = []
+        self.index: dict[str, set[int]] = {}
+        for number, name in enumerate(names):
+            tokens = self._get_tokens(name)
+            self.tokens.append(tokens)
+            for token in tokens:
+                for length in range(
+                    1, min(len(token), self.MAX_LEN_PREFIX_INDEX) + 1
+                ):
+                    self.index.setdefault(token[:length], set()).add(number)
+
+    @staticmethod
+    def _get_tokens(text: str) -> list[str]:
+        """Отдаёт слова текста в нижнем регистре.
+
+        Args:
+            text (str): текст.
+
+        Returns:
+            list[str]: слова.
+        """
+        return re.findall(r'\w+', text.lower().replace('ё', 'е'))
+
+    def search(self, text: str) -> set[int]:
+        """Отдаёт номера названий, слова которых начинаются на слова текста.
+
+        Args:
+            text (str): текст поиска.
+
+        Returns:
+            set[int]: номера найденных названий.
+        """
+        numbers = None
+        for token in self._get_tokens(text):
+            found = self.index.get(token[: self.MAX_LEN_PREFIX_INDEX], set())
+            if len(token) > self.MAX_LEN_PREFIX_INDEX:
+                found = {
+                    number
+                    for number in found
+                    if any(
+                        name_token.startswith(token)
+                        for name_token in self.tokens[number]
+                    )
+                }
+            numbers = found if numbers is None else numbers & found
+            if not numbers:
+                return set()
+        return numbers or set()
+
+
+class RubricsModel(QAbstractItemModel):
+    """Модель дерева рубрик с поиском."""
+
+    def __init__(self) -> None:
+        """Инициализация модели."""
+        super().__init__()
+        self.rubrics: list[RubricItem] = []
+        self.entries: list[tuple[int, int]] = []
+        self.index_search = RubricsIndex([])
+        self.text_filter = ''
+        self.visible_rubrics: list[int] = []
+        self.visible_children: dict[int, list[int] | None] = {}
+        self.rows_rubrics: dict[int, int] = {}
+
+    def set_rubrics(self, data: RubricsData) -> None:
+        """Устанавливает рубрики.
+
+        Args:
+            data (RubricsData): словарь рубрик.
+        """
+        self.rubrics = []
+        self.entries = []
+        names = []
+        for number, (name, values) in enumerate(data.items()):
+            subrubrics = values['subrubrics']
+            self.rubrics.append(
+                RubricItem(name, values['url'], True, number, subrubrics)
+            )
+            self.entries.append((number, -1))
+            names.append(name)
+            for number_subrubric, subrubric in enumerate(subrubrics):
+                self.entries.append((number, number_subrubric))
+                names.append(subrubric['name'])
+        self.index_search = RubricsIndex(names)
+        self.set_filter(self.text_filter)
+
+    def set_filter(self, text: str) -> None:
+        """Устанавливает фильтр рубрик.
+
+        Args:
+            text (str): текст фильтра.
+        """
+        self.beginResetModel()
+        self.text_filter = text
+        self.visible_children = {}
+        if not text.strip():
+            self.visible_rubrics = list(range(len(self.rubrics)))
+        else:
+            for number in sorted(self.index_search.search(text)):
+                number_rubric, number_subrubric = self.entries[number]
+                if number_subrubric == -1:
+                    self.visible_children[number_rubric] = None
+                    continue
+                children = self.visible_children.setdefault(number_rubric, [])
+                if children is not None:
+                    children.append(number_subrubric)
+            self.visible_rubrics = sorted(self.visible_children)
+        self.rows_rubrics = {
+            number: row for row, number in enumerate(self.visible_rubrics)
+        }
+        self.endResetModel()
+
+    def _get_children(self, number_rubric: int) -> list[int] | None:
+        """Отдаёт видимые подрубрики рубрики.
+
+        Args:
+            number_rubric (int): номер рубрики.
+
+        Returns:
+            list[int] | None: номера подрубрик, None - все подрубрики.
+        """
+        if not self.text_filter.strip():
+            return None
+        return self.visible_children.get(number_rubric)
+
+    def get_item(self, index: QModelIndex) -> RubricItem | None:
+        """Отдаёт рубрику по индексу модели.
+
+        Args:
+            index (QModelIndex): индекс.
+
+        Returns:
+            RubricItem | None: рубрика.
+        """
+        if not index.isValid():
+            return None
+        return index.internalPointer()
+
+    def index(
+        self,
+        row: int,
+        column: int,
+        parent: QModelIndex = QModelIndex(),
+    ) -> QModelIndex:
+        """Отдаёт индекс рубрики."""
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(
+                row, column, self.rubrics[self.visible_rubrics[row]]
+            )
+        rubric: RubricItem = parent.internalPointer()
+        children = self._get_children(rubric.number)
+        number = row if children is None else children[row]
+        return self.createIndex(row, column, rubric.get_child(number))
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        """Отдаёт индекс родительской рубрики."""
+        item = self.get_item(index)
+        if item is None or item.parent is None:
+            return QModelIndex()
+        return self.createIndex(
+            self.rows_rubrics[item.parent.number], 0, item.parent
+        )
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Отдаёт кол-во видимых рубрик или подрубрик."""
+        if not parent.isValid():
+            return len(self.visible_rubrics)
+        item: RubricItem = parent.internalPointer()
+        if not item.is_rubric:
+            return 0
+        children = self._get_children(item.number)
+        return len(item.subrubrics) if children is None else len(children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Отдаёт кол-во колонок."""
+        return 1
+
+    def data(
+        self,
+        index: QModelIndex,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """Отдаёт название рубрики."""
+        item = self.get_item(index)
+        if item is None or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return item.name
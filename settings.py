@@ -40,15 +40,59 @@ class ParserSettings(BaseSettings):
     SLUG_RUBRICS = 'rubrics'
     SLUG_SUBRUBRICS = 'subrubrics'
     SLUG_RUBRIC_ID = 'rubricId'
+    SLUG_SEARCH = 'search'
 
     API_2GIS = 'https://catalog.api.2gis.ru'
     API_2GIS_ITEMS = '/3.0/items'
+    API_2GIS_ITEMS_BY_ID = '/3.0/items/byid'
+    API_2GIS_REGIONS = '/2.0/region/search'
+    API_2GIS_RUBRICS = '/2.0/catalog/rubric/list'
+    RUBRICS_FROM_API = True
+    API_CODES_INVALID_KEY = (401, 403)
+    CACHE_META_CITY = False
+    NAME_META_CITY = 'meta'
+    TTL_META_CITY = 60 * 60 * 24
+    KEYS_META_CITY = ('key', 'viewpoint1', 'viewpoint2')
+    REGULAR_RUBRIC_ID = r'/rubricId/(\d+)'
+    PROBE_SUBRUBRICS = False
+    COUNT_ITEMS_PROBE = 20
+    TOLERANCE_TOTAL_PROBE = 0.0
+    TTL_PROBE = 60 * 60 * 24 * 28
+    DEDUP_FIRMS = 'keep'
+    MODES_DEDUP_FIRMS = ('keep', 'merge', 'flag')
+    SIZE_CELL_DEDUP = 0.001
+    MIN_MATCHES_DEDUP = 2
+    KEYS_MERGE_DEDUP = ('phone', 'email', 'image_href', 'site')
+    STOP_WORDS_DEDUP = (
+        'ооо',
+        'оао',
+        'зао',
+        'пао',
+        'ип',
+        'ул',
+        'улица',
+        'пр',
+        'проспект',
+        'пер',
+        'переулок',
+        'д',
+        'дом',
+        'к',
+        'корп',
+        'стр',
+    )
     API_HASH = 'baf4c54e9dae'
     API_FIELDS = (
         'items.adm_div,items.name_ex,items.external_content,'
         'items.contact_groups,items.address,items.schedule,'
-        'items.org'
+        'items.org,items.point'
     )
+    API_FIELDS_IDS = 'items.org'
+    PARSING_TWO_PHASE = False
+    DECODE_FIRMS = 'loop'
+    MODES_DECODE_FIRMS = ('loop', 'thread', 'process')
+    COUNT_WORKERS_DECODE = None
+    SIZE_BATCH_DETAILS = 50
     SIZE_PAGE = 50
     GX = 33
     MX = 5381
@@ -59,6 +103,14 @@ class ParserSettings(BaseSettings):
 
     VALIDATE_NAME_CITY = 'Москва'
     MAX_PAGE = 834
+    PARSING_TILES = False
+    MAX_TOTAL_TILE = MAX_PAGE * SIZE_PAGE // 2
+    MAX_DEPTH_TILE = 8
+    COUNT_CONCURRENT_REQUESTS = 20
+    COUNT_CONCURRENT_SUBRUBRICS = 4
+    RUN_DRIVER_IN_EXECUTOR = True
+    HARVEST_API_RESPONSES = True
+    ACCURACY_VIEWPOINT = 1e-6
     USER_AGENT = (
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_5) '
         'AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -67,7 +119,6 @@ class ParserSettings(BaseSettings):
     ARGS_OPTION = (
         '--log-level=3',
         '--blink-settings=imagesEnabled=false',
-        '--start-maximized',
         '--disable-infobars',
         '--disable-extensions',
         '--no-sandbox',
@@ -104,7 +155,127 @@ class ParserSettings(BaseSettings):
         'https://traffic*.edromaps.2gis.*',
         'https://disk.2gis.*/styles/*',
     )
+    BLOCKED_RESOURCES = {
+        'image': (
+            '*.png*',
+            '*.jpg*',
+            '*.jpeg*',
+            '*.gif*',
+            '*.webp*',
+            '*.svg*',
+            '*.ico*',
+        ),
+        'font': ('*.woff*', '*.ttf*', '*.otf*', '*.eot*'),
+        'media': ('*.mp4*', '*.webm*', '*.mp3*', '*.ogg*'),
+        'stylesheet': ('*.css*',),
+        'third_party': (
+            'https://*.yandex.ru/*',
+            'https://*.google.com/*',
+            'https://*.googletagmanager.com/*',
+            'https://*.doubleclick.net/*',
+            'https://*.sberbank.ru/*',
+            'https://*.mail.ru/*',
+            'https://*.vk.com/*',
+        ),
+    }
+    NAVIGATION_PROFILE = 'default'
+    NAVIGATION_PROFILES = {
+        'default': {
+            'headless': False,
+            'page_load_strategy': 'normal',
+            'blocked_resources': (),
+            'window_size': None,
+        },
+        'headless': {
+            'headless': True,
+            'page_load_strategy': 'normal',
+            'blocked_resources': (),
+            'window_size': (1920, 1080),
+        },
+        'eager': {
+            'headless': True,
+            'page_load_strategy': 'eager',
+            'blocked_resources': ('image', 'font', 'media', 'third_party'),
+            'window_size': (1280, 800),
+        },
+        'minimal': {
+            'headless': True,
+            'page_load_strategy': 'none',
+            'blocked_resources': (
+                'image',
+                'font',
+                'media',
+                'stylesheet',
+                'third_party',
+            ),
+            'window_size': (800, 600),
+        },
+    }
+    TIMEOUT_READY_PAGE = 15
+    MIN_TIMEOUT_READY = 2
+    COUNT_LATENCIES_READY = 100
+    PERCENTILE_READY = 95
+    FACTOR_TIMEOUT_READY = 3
+    INTERVAL_QUIET_DOM = 0.5
+    SCRIPT_WAITING_ELEMENT = """
+        const [selector, selectorContainer, timeout, quiet, done] = arguments;
+        let isDone = false;
+        let timerQuiet = null;
+        let timerTimeout = null;
+        let observer = null;
+        const finish = (result) => {
+            if (isDone) return;
+            isDone = true;
+            observer.disconnect();
+            clearTimeout(timerQuiet);
+            clearTimeout(timerTimeout);
+            done(result);
+        };
+        const check = () => {
+            if (document.querySelector(selector)) {
+                finish(true);
+            } else if (
+                selectorContainer
+                && document.querySelector(selectorContainer)
+            ) {
+                clearTimeout(timerQuiet);
+                timerQuiet = setTimeout(() => finish(false), quiet);
+            }
+        };
+        observer = new MutationObserver(check);
+        observer.observe(document, {childList: true, subtree: true});
+        timerTimeout = setTimeout(() => finish(null), timeout);
+        check();
+    """
+    DRIVER_CACHE_PATH = Path('cache', 'driver.json')
+    TTL_DRIVER_PATH = 60 * 60 * 24 * 7
+    COUNT_WARM_DRIVERS = 1
+    MAX_NAVIGATIONS_DRIVER = 200
+    MAX_MEMORY_DRIVER = 512 * 1024 * 1024
+    PROXIES_PATH = Path('proxies.txt')
+    RATE_PROXY = 5
+    BURST_PROXY = 10
+    MAX_ERRORS_PROXY = 3
+    QUARANTINE_PROXY = 30
+    WEIGHT_LATENCY = 0.2
+    COUNT_ATTEMPTS_PROXY = 3
+    CODES_ERROR_PROXY = (407, 429, 502, 503, 504)
+    PERSISTENT_PROFILE = False
+    USER_DATA_DIR = Path('cache', 'chrome')
+    DISK_CACHE_SIZE = 256 * 1024 * 1024
+    TTL_PROFILE_CACHE = 60 * 60 * 24
+    ARGS_DISABLE_CACHE = ('--disable-application-cache',)
+    IGNORE_PROFILE_FILES = (
+        'SingletonLock',
+        'SingletonSocket',
+        'SingletonCookie',
+        'lockfile',
+    )
     PARSING_BRANCHES = False
+    CACHE_BRANCHES_ON_DISK = False
+    BRANCHES_CACHE_DIR = Path('cache', 'branches')
+    TTL_BRANCHES = 60 * 60 * 24
+    MAX_SIZE_BRANCHES_CACHE = 10000
     KEYS_SKIP_SCHEDULE = (
         'comment',
         'is_24x7',
@@ -113,11 +284,37 @@ class ParserSettings(BaseSettings):
         'description',
     )
 
+    PROFILES_DIR = 'profiles'
+    NAME_TOTAL_PROFILE = 'total'
+    COUNT_TOP_PROFILE = 40
+    COUNT_TOP_ALLOCATIONS = 20
+    COUNT_FRAMES_ALLOCATIONS = 1
+    CATEGORIES_PROFILE = {
+        'selenium': 'selenium',
+        'aiohttp': 'aiohttp',
+        'json': 'json',
+        'parser': 'parser.py',
+        'normalizer': 'normalizer.py',
+    }
+
 
 class GUISettings(BaseSettings):
     """Настройки графического интерфейса."""
 
-    MAX_ROW_CONSOLE = 21
+    MAX_ROW_CONSOLE = 14
+    INTERVAL_FLUSH_CONSOLE = 200
+    LOG_TO_FILE = False
+    LOG_FILE_PATH = Path('logs', 'gui.log')
+    MAX_LEN_PREFIX_INDEX = 6
+    MAX_ROW_JOBS = 50
+    COUNT_WORKERS_JOBS = 2
+    INTERVAL_UPDATE_JOBS = 1000
+    PRIORITIES_JOBS = {
+        'upload': 0,
+        'rubrics': 1,
+        'firms': 2,
+        'city': 3,
+    }
     FORMAT_TIME = '%H:%M:%S'
 
     REGULAR_NAME_CITY = r'^[А-ЯЁ][а-яё]+(?:[ _-][А-ЯЁ][а-яё]+)*$'
@@ -133,6 +330,9 @@ class GUISettings(BaseSettings):
     BASE_PATH = Path(__file__).parent
     GUI_UI_PATH = BASE_PATH / 'gui.ui'
     SAVE_FORM_UI_PATH = BASE_PATH / 'save_form.ui'
+    SLUG_MANIFEST_API = 'manifest/'
+    TIMEOUT_REQUEST_API = 30
+    INCREMENTAL_UPLOAD = False
 
 
 class CompilationSettings:
@@ -164,3 +364,66 @@ class CompilationSettings:
         '--add-data',
         'logo.svg:.',
     )
+
+
+class BenchmarkSettings:
+    """Настройки бенчмарков."""
+
+    BASE_PATH = Path(__file__).parent
+
+    STARTUP_MODULES = ('main', 'parser', 'gui')
+    STARTUP_COMMANDS = (('--help',),)
+    COUNT_REPEAT_STARTUP = 5
+
+    URL_NAVIGATION = 'https://2gis.ru/moscow/search/Кафе/rubricId/161'
+    COUNT_REPEAT_NAVIGATION = 3
+
+
+class QuerySettings(BaseSettings):
+    """Настройки локального сервиса запросов."""
+
+    CITIES_DIR = Path('cities')
+    NAME_RUBRICS_FILE = 'rubrics.json'
+    STORE_PATH = Path('cache', 'firms.sqlite3')
+    HOST = '127.0.0.1'
+    PORT = 8765
+    PATH_FIRMS = '/firms'
+    SIZE_PAGE = 100
+    MAX_SIZE_PAGE = 1000
+    FIELDS_FIRM = (
+        'org_id',
+        'name',
+        'phone',
+        'address',
+        'email',
+        'image_href',
+        'site',
+        'work_schedule',
+    )
+    FIELDS_REQUIRED = ('phone', 'email', 'site', 'image_href')
+
+
+class RecrawlSettings(BaseSettings):
+    """Настройки планировщика повторного парсинга."""
+
+    NAME_RUBRICS_FILE = 'rubrics'
+    STATE_DIR = Path('cache', 'recrawl')
+    BUDGET_REQUESTS = 20000
+    PERIOD_BUDGET = 60 * 60 * 24
+    TTL_RUBRICS = 60 * 60 * 24 * 7
+    MIN_INTERVAL_RECRAWL = 60 * 60 * 12
+    MAX_INTERVAL_RECRAWL = 60 * 60 * 24 * 30
+    START_CHANGE_RATE = 1 / (60 * 60 * 24 * 7)
+    START_COST_RECRAWL = 100
+    WEIGHT_RECRAWL = 0.3
+    INTERVAL_DAEMON = 60
+
+
+class WriterSettings(BaseSettings):
+    """Настройки фоновой записи результатов."""
+
+    SIZE_QUEUE_WRITER = 32
+    COMPRESS_RESULTS = False
+    LEVEL_COMPRESS = 6
+    FSYNC_POLICY = 'file'
+    POLICIES_FSYNC = ('none', 'file', 'dir')
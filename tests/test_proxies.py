@@ -0,0 +1,201 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any, Iterator
+import asyncio
+import json
+import time
+
+import pytest
+
+from exceptions import ProxiesRejectedException
+from proxy_pool import Proxy, ProxyPool, proxy_pool
+
+
+def get_pool(*urls: str) -> ProxyPool:
+    """Отдаёт пул с прокси.
+
+    Args:
+        *urls (str): URL прокси.
+
+    Returns:
+        ProxyPool: пул прокси.
+    """
+    pool = ProxyPool()
+    pool.proxies = [Proxy(url, pool.BURST_PROXY) for url in urls]
+    return pool
+
+
+def test_token_bucket_waits_for_budget() -> None:
+    pool = get_pool('http://a:1')
+    pool.RATE_PROXY = 20
+    pool.BURST_PROXY = 2
+    pool.proxies[0].tokens = 2
+
+    async def acquire_three() -> float:
+        for _ in range(2):
+            pool.release(await pool.acquire(), 0.1)
+        start = time.monotonic()
+        pool.release(await pool.acquire(), 0.1)
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire_three()) >= 0.04
+
+
+def test_selects_least_loaded_proxy() -> None:
+    pool = get_pool('http://a:1', 'http://b:1', 'http://c:1')
+    pool.proxies[1].latency = 0.5
+    pool.proxies[2].latency = 0.1
+
+    async def acquire_two() -> list[Proxy]:
+        return [await pool.acquire(), await pool.acquire()]
+
+    first, second = asyncio.run(acquire_two())
+
+    assert first is pool.proxies[0]
+    assert second is pool.proxies[2]
+
+
+def test_quarantine_backoff_after_errors() -> None:
+    pool = get_pool('http://a:1', 'http://b:1')
+    proxy = pool.proxies[0]
+
+    for count_quarantines in (1, 2):
+        for _ in range(pool.MAX_ERRORS_PROXY):
+            proxy.in_flight += 1
+            pool.release(proxy)
+        assert proxy.count_quarantines == count_quarantines
+        assert proxy.quarantined_until - time.monotonic() == pytest.approx(
+            pool.QUARANTINE_PROXY * 2 ** (count_quarantines - 1), abs=1
+        )
+
+    assert asyncio.run(pool.acquire()) is pool.proxies[1]
+    assert pool.acquire_driver() is pool.proxies[1]
+
+    proxy.in_flight += 1
+    pool.release(proxy, 0.1)
+    assert proxy.count_errors == 0
+    assert proxy.count_quarantines == 0
+
+
+def test_drivers_skip_credentialed_proxies() -> None:
+    pool = get_pool('http://user:secret@a:1', 'http://b:2')
+
+    assert pool.acquire_driver() is pool.proxies[1]
+    assert pool.proxies[1].url_driver == 'http://b:2'
+
+    pool.proxies.pop()
+    assert pool.acquire_driver() is None
+
+
+class StandInProxy(ThreadingHTTPServer):
+    """Локальная замена прокси с заданным кодом ответа."""
+
+    def __init__(self, status: int) -> None:
+        """Инициализация прокси на свободном порту.
+
+        Args:
+            status (int): код ответа прокси.
+        """
+        super().__init__(('127.0.0.1', 0), StandInProxyHandler)
+        self.status = status
+        self.count_requests = 0
+
+    @property
+    def url(self) -> str:
+        """Отдаёт URL прокси.
+
+        Returns:
+            str: URL прокси.
+        """
+        return f'http://127.0.0.1:{self.server_port}'
+
+
+class StandInProxyHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов локального прокси."""
+
+    def do_GET(self) -> None:
+        """Отвечает заданным кодом и запрошенным URL."""
+        self.server.count_requests += 1
+        body = json.dumps({'url': self.path}).encode()
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        """Отключает журнал запросов."""
+
+
+@pytest.fixture
+def proxies(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[list[StandInProxy]]:
+    """Запускает локальные прокси и подставляет их в общий пул."""
+    servers = [StandInProxy(status) for status in request.param]
+    threads = [
+        Thread(target=server.serve_forever, daemon=True) for server in servers
+    ]
+    for thread in threads:
+        thread.start()
+    monkeypatch.setattr(
+        proxy_pool,
+        'proxies',
+        [Proxy(server.url, proxy_pool.BURST_PROXY) for server in servers],
+    )
+    try:
+        yield servers
+    finally:
+        for server, thread in zip(servers, threads):
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+def get_data_from_api(url: str) -> dict[str, Any]:
+    """Запрашивает API через парсер.
+
+    Args:
+        url (str): URL запроса.
+
+    Returns:
+        dict[str, Any]: ответ API.
+    """
+    pytest.importorskip('aiohttp')
+    from parser import Parser
+
+    parser = Parser()
+    try:
+        return parser._run(parser._get_data_from_api(url))
+    finally:
+        parser.close()
+
+
+@pytest.mark.parametrize('proxies', [(503, 200)], indirect=True)
+def test_retries_on_another_proxy(proxies: list[StandInProxy]) -> None:
+    data = get_data_from_api('http://api.test/items?page=1')
+
+    assert data == {'url': 'http://api.test/items?page=1'}
+    assert [proxy.count_requests for proxy in proxies] == [1, 1]
+    assert proxy_pool.proxies[0].count_errors == 1
+    assert proxy_pool.proxies[1].count_errors == 0
+
+
+@pytest.mark.parametrize('proxies', [(407, 429, 502)], indirect=True)
+def test_raises_when_all_proxies_reject(
+    proxies: list[StandInProxy],
+) -> None:
+    with pytest.raises(ProxiesRejectedException):
+        get_data_from_api('http://api.test/items?page=1')
+
+    assert [proxy.count_requests for proxy in proxies] == [1, 1, 1]
+
+
+def test_missing_proxies_file(tmp_path: Path) -> None:
+    pool = ProxyPool()
+
+    pool.load(tmp_path / 'proxies.txt')
+
+    assert pool.proxies == []
@@ -0,0 +1,181 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any, Iterator
+from urllib.parse import urlparse
+import json
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('PyQt6')
+
+from threads import SendFirmsToServerThread  # noqa: E402
+from upload_manifest import get_diff, get_key_firm, get_manifest  # noqa: E402
+
+FIRMS = [
+    {'org_id': '1', 'name': 'Аптека', 'address': 'Ленина, 1'},
+    {'org_id': '2', 'name': 'Кафе', 'address': 'Мира, 2'},
+    {'org_id': '', 'name': 'Ателье', 'address': 'Мира, 3'},
+]
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Локальная замена сервера приёма фирм."""
+
+    def __init__(self) -> None:
+        """Инициализация сервера на свободном порту."""
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.manifest: dict[str, str] | None = None
+        self.payloads: list[dict[str, Any]] = []
+
+    @property
+    def url_api(self) -> str:
+        """Отдаёт URL API сервера.
+
+        Returns:
+            str: URL API.
+        """
+        return f'http://127.0.0.1:{self.server_port}/api/firms/'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов локального сервера."""
+
+    def _send_json(self, status: int, data: Any) -> None:
+        """Отправляет ответ в JSON.
+
+        Args:
+            status (int): код ответа.
+            data (Any): данные ответа.
+        """
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        """Отдаёт манифест, если он есть на сервере."""
+        if (
+            urlparse(self.path).path != '/api/firms/manifest/'
+            or self.server.manifest is None
+        ):
+            self._send_json(404, {})
+            return
+        self._send_json(200, {'firms': self.server.manifest})
+
+    def do_POST(self) -> None:
+        """Принимает фирмы."""
+        length = int(self.headers['Content-Length'])
+        self.server.payloads.append(json.loads(self.rfile.read(length)))
+        self._send_json(201, {})
+
+    def log_message(self, *args: Any) -> None:
+        """Отключает журнал запросов."""
+
+
+@pytest.fixture
+def server() -> Iterator[StandInServer]:
+    """Запускает локальный сервер на время теста."""
+    server = StandInServer()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def send_firms(
+    server: StandInServer,
+    firms: list[dict[str, str]],
+    incremental: bool = True,
+) -> list[str]:
+    """Отправляет фирмы на локальный сервер.
+
+    Args:
+        server (StandInServer): локальный сервер.
+        firms (list[dict[str, str]]): фирмы.
+        incremental (bool, optional): флаг отправки только изменений.
+            Defaults to True.
+
+    Returns:
+        list[str]: сообщения формы сохранения.
+    """
+    messages = []
+    thread = SendFirmsToServerThread(
+        firms,
+        'moscow',
+        'pharmacy',
+        server.url_api,
+        lambda message, *args: messages.append(message),
+        incremental=incremental,
+    )
+    thread._send_firms()
+    return messages
+
+
+def test_get_diff() -> None:
+    changed_firm = {**FIRMS[1], 'address': 'Мира, 20'}
+    manifest = get_manifest(FIRMS[:2])
+    manifest['3'] = 'hash'
+
+    changed_firms, deleted_keys = get_diff(
+        [FIRMS[0], changed_firm, FIRMS[2]], manifest
+    )
+
+    assert changed_firms == [changed_firm, FIRMS[2]]
+    assert deleted_keys == ['3']
+    assert get_key_firm(FIRMS[0]) == '1'
+    assert get_key_firm(FIRMS[2]) != get_key_firm(
+        {**FIRMS[2], 'address': 'Мира, 4'}
+    )
+
+
+def test_full_upload_without_manifest(server: StandInServer) -> None:
+    messages = send_firms(server, FIRMS)
+
+    assert messages == ['Фирмы загружаются']
+    assert server.payloads == [
+        {'firms': FIRMS, 'city': 'moscow', 'rubric': 'pharmacy'}
+    ]
+
+
+def test_full_upload_when_not_incremental(server: StandInServer) -> None:
+    server.manifest = get_manifest(FIRMS)
+
+    send_firms(server, FIRMS, incremental=False)
+
+    assert server.payloads[0]['firms'] == FIRMS
+    assert 'incremental' not in server.payloads[0]
+
+
+def test_incremental_upload_with_manifest(server: StandInServer) -> None:
+    changed_firm = {**FIRMS[1], 'name': 'Кофейня'}
+    server.manifest = get_manifest(FIRMS[:2])
+    server.manifest['3'] = 'hash'
+
+    messages = send_firms(server, [FIRMS[0], changed_firm, FIRMS[2]])
+
+    assert messages == ['Фирмы загружаются']
+    assert server.payloads == [
+        {
+            'firms': [changed_firm, FIRMS[2]],
+            'deleted': ['3'],
+            'incremental': True,
+            'city': 'moscow',
+            'rubric': 'pharmacy',
+        }
+    ]
+
+
+def test_no_changes(server: StandInServer) -> None:
+    server.manifest = get_manifest(FIRMS)
+
+    messages = send_firms(server, FIRMS)
+
+    assert messages == ['Изменений нет']
+    assert server.payloads == []
@@ -1,20 +1,28 @@
-from pathlib import Path
-from os.path import join
+from urllib.parse import urljoin
 from typing import Any
-import json
 
 from PyQt6.QtCore import pyqtSignal, QThread
-from PyQt6.QtWidgets import QListWidgetItem
-import requests
-from requests.exceptions import ConnectionError
-
 from parser import Parser
-from typings import RubricsData, FirmRubricData, FirmSubrubricData
+from typings import (
+    RubricsData,
+    FirmRubricData,
+    FirmSubrubricData,
+    Manifest,
+)
+from rubrics_model import RubricItem
+from settings import GUISettings
+from upload_manifest import get_diff
+from writer import result_writer
 from exceptions import NoCityOn2GISException
 
 
 class SendFirmsToServerThread(QThread):
-    """Поток отправки фирм на сервер."""
+    """Поток отправки фирм на сервер.
+
+    В инкрементальном режиме отправляются только добавленные,
+    изменённые и удалённые фирмы относительно манифеста сервера.
+    Без манифеста сервера фирмы отправляются полностью.
+    """
 
     load_finished = pyqtSignal(object)
 
@@ -26,6 +34,7 @@ class SendFirmsToServerThread(QThread):
         url_api: str,
         set_message_save_form: Any,
         auth_data: str | None = None,
+        incremental: bool = False,
     ) -> None:
         """Инициализация потока
 
@@ -37,6 +46,8 @@ class SendFirmsToServerThread(QThread):
             set_message_save_form (Any): метод установки сообщения.
             auth_data (str | None, optional):
                 Данные аутентификации. Defaults to None.
+            incremental (bool, optional):
+                Флаг отправки только изменений. Defaults to False.
         """
         super().__init__()
         self.firms = firms
@@ -45,21 +56,84 @@ class SendFirmsToServerThread(QThread):
         self.url_api = url_api
         self.set_message_save_form = set_message_save_form
         self.auth_data = auth_data
+        self.incremental = incremental
+
+    def _get_manifest(
+        self,
+        headers: dict[str, str] | None,
+    ) -> Manifest | None:
+        """Отдаёт манифест фирм, уже сохранённых на сервере.
+
+        При ошибке запроса или отсутствии манифеста на сервере
+        фирмы отправляются полностью.
+
+        Args:
+            headers (dict[str, str] | None): заголовки запроса.
+
+        Returns:
+            Manifest | None: манифест, None - манифеста нет.
+        """
+        import requests
+        from requests.exceptions import RequestException
+
+        try:
+            response = requests.get(
+                urljoin(self.url_api, GUISettings.SLUG_MANIFEST_API),
+                headers=headers,
+                params={'city': self.slug_city, 'rubric': self.slug_rubric},
+                timeout=GUISettings.TIMEOUT_REQUEST_API,
+            )
+            if response.status_code == 200:
+                manifest = response.json().get('firms')
+                if isinstance(manifest, dict):
+                    return manifest
+        except (RequestException, ValueError, AttributeError):
+            pass
+        return None
+
+    def _get_payload(self, headers: dict[str, str] | None) -> dict[str, Any]:
+        """Отдаёт данные для отправки.
+
+        Args:
+            headers (dict[str, str] | None): заголовки запроса.
+
+        Returns:
+            dict[str, Any]: данные для отправки.
+        """
+        payload = {
+            'firms': self.firms,
+            'city': self.slug_city,
+            'rubric': self.slug_rubric,
+        }
+        if not self.incremental:
+            return payload
+        manifest = self._get_manifest(headers)
+        if manifest is None:
+            return payload
+        payload['firms'], payload['deleted'] = get_diff(self.firms, manifest)
+        payload['incremental'] = True
+        return payload
 
     def _send_firms(self) -> None:
         """Отправка фирм на сервер."""
+        import requests
+        from requests.exceptions import ConnectionError, Timeout
+
         headers = None
         if self.auth_data:
             headers = {'Authorization': self.auth_data}
         try:
+            payload = self._get_payload(headers)
+            if payload.get('incremental') and not (
+                payload['firms'] or payload['deleted']
+            ):
+                self.set_message_save_form('Изменений нет', 3, 'green')
+                return
             response = requests.post(
                 self.url_api,
                 headers=headers,
-                json={
-                    'firms': self.firms,
-                    'city': self.slug_city,
-                    'rubric': self.slug_rubric,
-                },
+                json=payload,
+                timeout=GUISettings.TIMEOUT_REQUEST_API,
             )
             if response.status_code == 201:
                 self.set_message_save_form('Фирмы загружаются', 3, 'green')
@@ -73,7 +147,7 @@ class SendFirmsToServerThread(QThread):
                     3,
                     'red',
                 )
-        except ConnectionError:
+        except (ConnectionError, Timeout):
             self.set_message_save_form('Ошибка соединения', 3, 'red')
 
     def run(self) -> None:
@@ -86,6 +160,7 @@ class BaseParsingTread(QThread):
     """Базовый поток для парсинга."""
 
     load_finished = pyqtSignal(object)
+    firms_parsed = pyqtSignal(int)
 
     def _message_parse_firms(
         self,
@@ -100,7 +175,7 @@ class BaseParsingTread(QThread):
             count_no_duplicates_firms (int): кол-во фирм без дубликатов.
             count_duplicates_firms (int): количество дубликатов.
         """
-
+        self.firms_parsed.emit(count_no_duplicates_firms)
         self.set_row_in_console(
             f'Сохранено фирм: {count_no_duplicates_firms}, '
             f'удалено дубликатов: {count_duplicates_firms}',
@@ -113,23 +188,29 @@ class BaseParsingTread(QThread):
         message_console: str,
         data: Any,
     ) -> None:
-        """Сохраняет данные.
+        """Ставит данные в очередь фоновой записи.
+
+        Сообщение выводится в консоль после записи файла.
 
         Args:
             name_file (str): название файла.
             message_console (str): сообщение в консоль.
             data (Any): данные для сохранения.
         """
-        city_dir = join('cities', self.parser.SLUG_CITY)
-        Path(city_dir).mkdir(
-            parents=True,
-            exist_ok=True,
+
+        def on_saved(error: Exception | None) -> None:
+            if error is None:
+                self.set_row_in_console(
+                    message_console, 'green', self.support_info
+                )
+                return
+            self.set_row_in_console(
+                f'Ошибка сохранения "{name_file}": {error}', 'red', 'Ошибка'
+            )
+
+        result_writer.write(
+            self.parser._get_path_data(name_file), data, on_saved
         )
-        with open(
-            join(city_dir, f'{name_file.replace('/', '')}.json'), 'w'
-        ) as file:
-            json.dump(data, file)
-        self.set_row_in_console(message_console, 'green', self.support_info)
 
 
 class ParsingFirmRubricTread(BaseParsingTread):
@@ -140,7 +221,7 @@ class ParsingFirmRubricTread(BaseParsingTread):
     def __init__(
         self,
         set_row_in_console: Any,
-        rubric: QListWidgetItem,
+        rubric: RubricItem,
         slug_city: str,
         validate_name_city: str,
     ) -> None:
@@ -148,7 +229,7 @@ class ParsingFirmRubricTread(BaseParsingTread):
 
         Args:
             set_row_in_console (Any): метод установки строчки в консоль.
-            rubric (QListWidgetItem): выбранная рубрика.
+            rubric (RubricItem): выбранная рубрика.
             validate_name_city (str): название города.
         """
         super().__init__()
@@ -178,7 +259,7 @@ class ParsingFirmRubricTread(BaseParsingTread):
             'blue',
             self.support_info,
         )
-        return (name, {'firms': firms})
+        return (name, self.parser._get_subrubric_data(name, firms))
 
     def _parsing_rubric_firm(self) -> tuple[str, FirmRubricData]:
         """Парсинг фирм рубрики.
@@ -193,18 +274,22 @@ class ParsingFirmRubricTread(BaseParsingTread):
             self.support_info,
         )
         data = {'subrubrics': []}
-        for subrubric in self.rubric.subrubrics:
-            name = subrubric['name']
-            self.set_row_in_console(
-                f'Старт парсинга фирм подрубрики "{name}"',
-                support_info=self.support_info,
-            )
-            firms, _ = self.parser._get_firms((name, subrubric['url']))
-            data['subrubrics'].append({name: firms})
-            self.set_row_in_console(
-                f'Конец парсинга фирм подрубрики "{name}"',
-                support_info=self.support_info,
-            )
+        orgs_id = set()
+        with self.parser._scope_firms_index():
+            for subrubric in self.rubric.subrubrics:
+                name = subrubric['name']
+                self.set_row_in_console(
+                    f'Старт парсинга фирм подрубрики "{name}"',
+                    support_info=self.support_info,
+                )
+                firms, _ = self.parser._get_firms(
+                    (name, subrubric['url']), orgs_id
+                )
+                data['subrubrics'].append({name: firms})
+                self.set_row_in_console(
+                    f'Конец парсинга фирм подрубрики "{name}"',
+                    support_info=self.support_info,
+                )
         self.set_row_in_console(
             f'Конец парсинга фирм рубрики "{rubric_name}"',
             'blue',
@@ -223,7 +308,9 @@ class ParsingFirmRubricTread(BaseParsingTread):
                         self._save_data(
                             name,
                             f'Фирмы рубрики "{name}" сохранены',
-                            {'firms': subrubric[name]},
+                            self.parser._get_subrubric_data(
+                                name, subrubric[name]
+                            ),
                         )
             else:
                 name, data = self._parsing_subrubric_firm()
@@ -242,7 +329,7 @@ class ParsingFirmRubricTread(BaseParsingTread):
                 'Ошибка',
             )
         self.load_finished.emit(True)
-        self.parser.driver.close()
+        self.parser.close()
 
 
 class ParsingFirmRubricsThread(BaseParsingTread):
@@ -289,7 +376,7 @@ class ParsingFirmRubricsThread(BaseParsingTread):
                     self._save_data(
                         name,
                         f'Фирмы рубрики "{name}" сохранены',
-                        {'firms': firms},
+                        self.parser._get_subrubric_data(name, firms),
                     )
             self.load_finished.emit(None)
         except NoCityOn2GISException:
@@ -311,7 +398,7 @@ class ParsingFirmRubricsThread(BaseParsingTread):
                 'Ошибка',
             )
             self.load_finished.emit(None)
-        self.parser.driver.close()
+        self.parser.close()
 
 
 class ParsingRubricsThread(BaseParsingTread):
@@ -335,9 +422,22 @@ class ParsingRubricsThread(BaseParsingTread):
         super().__init__()
         self.set_row_in_console = set_row_in_console
         self.parser = Parser()
+        self.parser.signal_parse_rubric = self._message_parse_rubric
         self.parser.SLUG_CITY = slug_city
         self.parser.VALIDATE_NAME_CITY = validate_name_city
 
+    def _message_parse_rubric(self, name: str, count_subrubrics: int) -> None:
+        """Сообщение о парсинге рубрики.
+
+        Args:
+            name (str): название рубрики.
+            count_subrubrics (int): кол-во подрубрик.
+        """
+        self.set_row_in_console(
+            f'Рубрика "{name}": {count_subrubrics} подрубрик',
+            support_info=self.support_info,
+        )
+
     def _get_data(self) -> RubricsData:
         """Отдаёт данные по рубрикам.
 
@@ -349,25 +449,7 @@ class ParsingRubricsThread(BaseParsingTread):
             'blue',
             self.support_info,
         )
-        data = {}
-        for a_rubric in self.parser._get_rubrics():
-            name = a_rubric[0]
-            self.set_row_in_console(
-                f'Старт парсинга рубрики "{name}"',
-                support_info=self.support_info,
-            )
-            data[name] = {'url': a_rubric[1], 'subrubrics': []}
-            for a_subrubric in self.parser._get_subrubrics(a_rubric):
-                data[name]['subrubrics'].append(
-                    {
-                        'name': a_subrubric[0],
-                        'url': a_subrubric[1],
-                    }
-                )
-            self.set_row_in_console(
-                f'Конец парсинга рубрики "{name}"',
-                support_info=self.support_info,
-            )
+        data = self.parser.parsing_rubrics()
         self.set_row_in_console(
             'Конец парсинга рубрик',
             'blue',
@@ -400,4 +482,4 @@ class ParsingRubricsThread(BaseParsingTread):
                 'Ошибка',
             )
             self.load_finished.emit({})
-        self.parser.driver.close()
+        self.parser.close()
@@ -1,3 +1,6 @@
 type RubricsData = dict[str, dict[str, str | list[dict[str, str]]]]
 type FirmRubricData = dict[str, list[dict[str, list[dict[str, str]]]]]
 type FirmSubrubricData = dict[str, list[dict[str, str]]]
+type KeyFirm = tuple[str, str]
+type Cell = tuple[int, int] | None
+type Manifest = dict[str, str]
@@ -0,0 +1,71 @@
+from typing import Any
+import hashlib
+import json
+
+from typings import Manifest
+
+
+def get_key_firm(firm: dict[str, Any]) -> str:
+    """Отдаёт ключ фирмы в манифесте.
+
+    Args:
+        firm (dict[str, Any]): данные по фирме.
+
+    Returns:
+        str: id организации, либо хэш названия и адреса.
+    """
+    if firm.get('org_id'):
+        return firm['org_id']
+    return hashlib.sha1(
+        f'{firm.get('name')}|{firm.get('address')}'.encode()
+    ).hexdigest()
+
+
+def get_hash_firm(firm: dict[str, Any]) -> str:
+    """Отдаёт хэш содержимого фирмы.
+
+    Args:
+        firm (dict[str, Any]): данные по фирме.
+
+    Returns:
+        str: хэш.
+    """
+    return hashlib.sha1(
+        json.dumps(firm, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def get_manifest(firms: list[dict[str, Any]]) -> Manifest:
+    """Отдаёт манифест фирм.
+
+    Args:
+        firms (list[dict[str, Any]]): фирмы.
+
+    Returns:
+        Manifest: хэш содержимого по ключу фирмы.
+    """
+    return {get_key_firm(firm): get_hash_firm(firm) for firm in firms}
+
+
+def get_diff(
+    firms: list[dict[str, Any]],
+    manifest: Manifest,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Отдаёт изменения фирм относительно манифеста.
+
+    Args:
+        firms (list[dict[str, Any]]): фирмы.
+        manifest (Manifest): манифест последней отправки.
+
+    Returns:
+        tuple[list[dict[str, Any]], list[str]]:
+            добавленные и изменённые фирмы, ключи удалённых фирм.
+    """
+    changed_firms = []
+    keys = set()
+    for firm in firms:
+        key = get_key_firm(firm)
+        keys.add(key)
+        if manifest.get(key) != get_hash_firm(firm):
+            changed_firms.append(firm)
+    return changed_firms, [key for key in manifest if key not in keys]
@@ -0,0 +1,219 @@
+from pathlib import Path
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any, Callable
+import atexit
+import gzip
+import json
+import os
+import tempfile
+
+from settings import WriterSettings
+
+
+def _get_mode_file() -> int:
+    """Отдаёт права нового файла с учётом umask процесса.
+
+    Returns:
+        int: права файла.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+MODE_FILE = _get_mode_file()
+
+
+def get_path_compressed(path: Path | str) -> Path:
+    """Отдаёт путь к сжатой версии файла.
+
+    Args:
+        path (Path | str): путь к файлу.
+
+    Returns:
+        Path: путь к файлу с расширением .gz.
+    """
+    path = Path(path)
+    return path.with_name(f'{path.name}.gz')
+
+
+def read_json(path: Path | str) -> Any:
+    """Читает JSON-файл результата, сжатый или нет.
+
+    Если файла нет, читается его сжатая версия.
+
+    Args:
+        path (Path | str): путь к файлу.
+
+    Raises:
+        OSError: ошибка чтения файла.
+        json.decoder.JSONDecodeError: невалидный JSON.
+
+    Returns:
+        Any: данные.
+    """
+    path = Path(path)
+    if path.suffix != '.gz' and not path.exists():
+        path_compressed = get_path_compressed(path)
+        if path_compressed.exists():
+            path = path_compressed
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            return json.load(file)
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def write_atomic(
+    path: Path | str,
+    content: bytes,
+    is_fsync: bool = False,
+) -> None:
+    """Атомарно записывает содержимое в файл.
+
+    Содержимое пишется во временный файл рядом с целевым, который
+    затем заменяет целевой. Права файла - как у созданного open().
+
+    Args:
+        path (Path | str): путь к файлу.
+        content (bytes): содержимое.
+        is_fsync (bool, optional): fsync файла перед заменой.
+            Defaults to False.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, path_temp = tempfile.mkstemp(
+        dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+            file.flush()
+            if is_fsync:
+                os.fsync(file.fileno())
+        os.chmod(path_temp, MODE_FILE)
+        os.replace(path_temp, path)
+    except BaseException:
+        Path(path_temp).unlink(missing_ok=True)
+        raise
+
+
+class ResultWriter(WriterSettings):
+    """Фоновая атомарная запись результатов в JSON.
+
+    Данные ставятся в ограниченную очередь и записываются отдельным
+    потоком во временный файл рядом с целевым, который затем заменяет
+    целевой. Файл результата никогда не бывает записан наполовину.
+    При заполненной очереди запись ждёт свободного места.
+
+    Политики fsync: 'none' - без fsync, 'file' - fsync файла перед
+    заменой, 'dir' - дополнительно fsync директории после замены.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация записи."""
+        self.queue: Queue[
+            tuple[Path, Any, Callable[[Exception | None], None] | None] | None
+        ] = Queue(maxsize=self.SIZE_QUEUE_WRITER)
+        self.lock = Lock()
+        self.thread: Thread | None = None
+
+    def _start(self) -> None:
+        """Запускает поток записи при необходимости."""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = Thread(
+                    target=self._run, name='result-writer', daemon=True
+                )
+                self.thread.start()
+
+    def write(
+        self,
+        path: Path | str,
+        data: Any,
+        callback: Callable[[Exception | None], None] | None = None,
+    ) -> None:
+        """Ставит данные в очередь записи.
+
+        Args:
+            path (Path | str): путь к файлу.
+            data (Any): данные для сохранения.
+            callback (Callable[[Exception | None], None] | None,
+                optional): вызывается в потоке записи с ошибкой
+                или None после записи. Defaults to None.
+        """
+        self._start()
+        self.queue.put((Path(path), data, callback))
+
+    def _fsync_dir(self, path: Path) -> None:
+        """Сбрасывает на диск директорию файла.
+
+        Args:
+            path (Path): путь к файлу.
+        """
+        try:
+            fd = os.open(path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _write(self, path: Path, data: Any) -> None:
+        """Атомарно записывает данные в файл.
+
+        Args:
+            path (Path): путь к файлу.
+            data (Any): данные для сохранения.
+        """
+        path_stale = get_path_compressed(path)
+        if self.COMPRESS_RESULTS:
+            path, path_stale = path_stale, path
+        content = json.dumps(data).encode()
+        if self.COMPRESS_RESULTS:
+            content = gzip.compress(content, self.LEVEL_COMPRESS)
+        write_atomic(path, content, self.FSYNC_POLICY != 'none')
+        path_stale.unlink(missing_ok=True)
+        if self.FSYNC_POLICY == 'dir':
+            self._fsync_dir(path)
+
+    def _run(self) -> None:
+        """Записывает данные из очереди до сигнала остановки."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            path, data, callback = item
+            error = None
+            try:
+                self._write(path, data)
+            except (OSError, TypeError, ValueError) as write_error:
+                error = write_error
+            try:
+                if callback is not None:
+                    callback(error)
+            finally:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        """Ждёт записи всех данных очереди."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+    def close(self) -> None:
+        """Записывает данные очереди и останавливает поток."""
+        with self.lock:
+            thread = self.thread
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(None)
+        thread.join()
+
+
+result_writer = ResultWriter()
+atexit.register(result_writer.close)